@@ -38,6 +38,18 @@ if os.environ.get("FIRESTORE_DB_NAME") == "default":
     const.FIRESTORE_DATABASE = "(default)"
 else:
     const.FIRESTORE_DATABASE = os.environ.get("FIRESTORE_DB_NAME")
+const.FIRESTORE_CLIENT_POOL_SIZE = max(
+    1, int(os.environ.get("FIRESTORE_CLIENT_POOL_SIZE", "4"))
+)
+const.FIRESTORE_CACHE_TTL_SECONDS = max(
+    0, int(os.environ.get("FIRESTORE_CACHE_TTL_SECONDS", "60"))
+)
+const.FIRESTORE_CACHE_MAXSIZE = max(
+    1, int(os.environ.get("FIRESTORE_CACHE_MAXSIZE", "1024"))
+)
+const.FIRESTORE_STALE_READ_SECONDS = max(
+    0, int(os.environ.get("FIRESTORE_STALE_READ_SECONDS", "0"))
+)
 
 #####################
 ## for ADK
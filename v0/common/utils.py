@@ -1,35 +1,66 @@
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
 
-def convert_utc_to_jst(utc_timestamp: str | datetime) -> str:
+@lru_cache(maxsize=1)
+def _get_jst() -> timezone:
+    # common.const は初期化中に strtobool を import するため、ここで遅延 import する
+    # ADJUST_TIME はプロセス内で不変なので、生成した timezone を使い回す
     from common.const import ADJUST_TIME
 
-    formatted_jst_timestamp = None
+    return timezone(timedelta(hours=ADJUST_TIME))
+
+
+def convert_utc_to_jst(utc_timestamp: str | datetime) -> str | datetime:
+    """UTC の日時を JST に変換する
+
+    文字列を渡した場合は "%Y-%m-%d %H:%M:%S" 形式の文字列を返す。
+    datetime を渡した場合は Firestore にそのまま保存できる aware な datetime を返す。
+    """
     if isinstance(utc_timestamp, str):
-        utc_timestamp = datetime.fromisoformat(utc_timestamp.replace("Z", "+00:00"))
-        jst = timezone(timedelta(hours=ADJUST_TIME))
-        jst_timestamp = utc_timestamp.astimezone(jst)
-        jst_timestamp = jst_timestamp.replace(tzinfo=None)
-        formatted_jst_timestamp = jst_timestamp.strftime("%Y-%m-%d %H:%M:%S")
-    else:
-        formatted_jst_timestamp = utc_timestamp.astimezone(
-            timezone(timedelta(hours=ADJUST_TIME))
+        # Python 3.11+ の fromisoformat は末尾の "Z" をそのまま解釈できる
+        # 固定書式 "%Y-%m-%d %H:%M:%S" は strftime を通さず直接組み立てる
+        d = datetime.fromisoformat(utc_timestamp).astimezone(_get_jst())
+        return (
+            f"{d.year:04d}-{d.month:02d}-{d.day:02d} "
+            f"{d.hour:02d}:{d.minute:02d}:{d.second:02d}"
         )
+    jst = _get_jst()
+    # 既に JST の datetime であれば変換せずにそのまま返す
+    if utc_timestamp.tzinfo is jst:
+        return utc_timestamp
+    return utc_timestamp.astimezone(jst)
+
+
+_TRUE_VALUES = frozenset({"y", "yes", "t", "true", "on", "1"})
+_FALSE_VALUES = frozenset({"n", "no", "f", "false", "off", "0"})
 
-    return formatted_jst_timestamp
+# 小文字・大文字・先頭大文字の表記を事前登録し、よくある入力では lower() を省く
+_BOOL_MAP: dict[str, bool] = {}
+for _values, _result in ((_TRUE_VALUES, True), (_FALSE_VALUES, False)):
+    for _value in _values:
+        for _variant in (_value, _value.upper(), _value.capitalize()):
+            _BOOL_MAP[_variant] = _result
+del _values, _result, _value, _variant
+# これより長い文字列はどの表記にも一致しないため lower() せずに弾ける
+_BOOL_MAX_LEN = max(map(len, _BOOL_MAP))
 
 
 def strtobool(val: str) -> bool:
-    """Convert a string representation of truth to true (1) or false (0).
+    """Convert a string representation of truth to True or False.
 
     True values are 'y', 'yes', 't', 'true', 'on', and '1'; false values
     are 'n', 'no', 'f', 'false', 'off', and '0'.  Raises ValueError if
-    'val' is anything else.
+    'val' is anything else, and TypeError if 'val' is not a string.
     """
-    _lower_val = val.lower()
-    if _lower_val in ("y", "yes", "t", "true", "on", "1"):
-        return 1
-    elif _lower_val in ("n", "no", "f", "false", "off", "0"):
-        return 0
-    else:
-        raise ValueError("invalid truth value {!r}".format(_lower_val))
+    result = _BOOL_MAP.get(val)
+    if result is not None:
+        return result
+    # 型チェックは直接ヒットしなかった場合だけ行い、通常経路を軽く保つ
+    if not isinstance(val, str):
+        raise TypeError("truth value must be str, not {}".format(type(val).__name__))
+    if len(val) <= _BOOL_MAX_LEN:
+        result = _BOOL_MAP.get(val.lower())
+    if result is None:
+        raise ValueError("invalid truth value {!r}".format(val.lower()))
+    return result
@@ -1,6 +1,6 @@
 from google.adk import agents
 from google.adk.tools import FunctionTool, get_user_choice
-from common.firestore_tools import firestore_get_all_projects
+from common.firestore_tools import firestore_get_all_projects_dict
 
 project_librarian_agent = agents.LlmAgent(
    name="project_librarian",
@@ -15,7 +15,7 @@ project_librarian_agent = agents.LlmAgent(
    - 会話の文脈を維持してください。一度プロジェクトが特定されたら、その後は「そのプロジェクトについて話している」という前提で回答を補足してください。
    
    ### 業務手順
-   1. ユーザーからプロジェクトについて尋ねられたら、まず「firestore_get_all_projects」ツールを使って、
+   1. ユーザーからプロジェクトについて尋ねられたら、まず「firestore_get_all_projects_dict」ツールを使って、
       現在登録されているすべてのプロジェクト情報を取得してください。
       
    2. プロジェクト一覧を取得したら、ユーザーの質問に関連がありそうなプロジェクトを見つけてください。
@@ -28,5 +28,5 @@ project_librarian_agent = agents.LlmAgent(
    5. 「いいえ」の場合は、他に該当しそうなプロジェクトがないか探すか、
       見つからなければ「申し訳ありません、該当するプロジェクトが見つかりませんでした」と伝えてください。
    """,
-   tools=[firestore_get_all_projects, get_user_choice]
+   tools=[firestore_get_all_projects_dict, get_user_choice]
 )
\ No newline at end of file
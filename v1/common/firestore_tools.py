@@ -1,64 +1,441 @@
 """Simple Firestore tools for ADK agents."""
 
+import asyncio
+import contextlib
+import contextvars
+import copy
+import functools
+import itertools
+import json
+import time
+from collections import OrderedDict
+from google.api_core import exceptions as api_exceptions
+from google.api_core import retry_async
 from google.cloud import firestore
-from typing import Any, Optional, List, Dict
+from google.cloud.firestore_v1.base_document import BaseDocumentReference
+from google.cloud.firestore_v1.base_query import FieldFilter, Or
+from typing import Any, Callable, Optional, List, Dict
 from datetime import datetime, timedelta
 from datetime import timezone as dt_timezone
 from zoneinfo import ZoneInfo
 import uuid
 
-from common.const import PROJECT_ID, FIRESTORE_DATABASE, logger
-from common.utils import convert_utc_to_jst
+from common.const import (
+    PROJECT_ID,
+    FIRESTORE_DATABASE,
+    FIRESTORE_CLIENT_POOL_SIZE,
+    FIRESTORE_CACHE_TTL_SECONDS,
+    FIRESTORE_CACHE_MAXSIZE,
+    FIRESTORE_STALE_READ_SECONDS,
+    logger,
+)
 
-# グローバルなFirestoreクライアント（再利用可能でスレッドセーフ）
+# グローバルなFirestoreクライアント（再利用可能、I/O待ちをイベントループ上で重ねられる非同期版）
+# 1本のチャネルの同時ストリーム数に縛られないよう、複数のクライアントを順番に使い回す
+logger.debug(
+    "🔧 Initializing Firestore clients (project=%s, database=%s, pool=%s)",
+    PROJECT_ID,
+    FIRESTORE_DATABASE,
+    FIRESTORE_CLIENT_POOL_SIZE,
+)
+_db_clients = [
+    firestore.AsyncClient(project=PROJECT_ID, database=FIRESTORE_DATABASE)
+    for _ in range(FIRESTORE_CLIENT_POOL_SIZE)
+]
+_db_client_cycle = itertools.cycle(_db_clients)
 logger.debug(
-    f"🔧 Initializing Firestore client (project={PROJECT_ID}, database={FIRESTORE_DATABASE})"
+    "✅ Firestore clients initialized successfully (ids: %s)",
+    [id(c) for c in _db_clients],
 )
-_db_client = firestore.Client(project=PROJECT_ID, database=FIRESTORE_DATABASE)
-logger.debug(f"✅ Firestore client initialized successfully (id: {id(_db_client)})")
 
 
-def _clean_firestore_data(data: Any) -> Any:
+def _get_db() -> firestore.AsyncClient:
     """
-    FirestoreのデータからJSON化できないオブジェクトを除去・変換する
+    プールからFirestoreクライアントをラウンドロビンで1つ取り出す
+
+    どのクライアントも同じデータベースを指し、読み取りや単発の書き込み・バッチは
+    クライアントに状態を持たないので、呼び出しごとに別のクライアントを使ってよい。
+    （トランザクションを使う場合は、その中で同じクライアントを使い続けること）
+    """
+    return next(_db_client_cycle)
+
+
+# 読み取りRPCの一時的なエラー（UNAVAILABLE / DEADLINE_EXCEEDED）は指数バックオフで再試行する
+# 再試行しても失敗した場合のみ、各関数の例外処理で空の結果を返す
+_READ_RETRY = retry_async.AsyncRetry(
+    predicate=retry_async.if_exception_type(
+        api_exceptions.ServiceUnavailable, api_exceptions.DeadlineExceeded
+    ),
+    initial=0.1,
+    maximum=2.0,
+    multiplier=2.0,
+    timeout=10.0,
+)
+
+# 読み取り中心のコンテキスト・プロフィールは、この秒数だけ過去の時点で読む（0なら最新を読む）
+# 過去の時点の読み取りは、サーバー側で最新のコミットを待たずに返せる
+_STALE_READ_SECONDS = FIRESTORE_STALE_READ_SECONDS
+
+
+def _stale_read_time() -> Optional[datetime]:
+    """
+    古さを許容する読み取りに使う read_time を返す（無効な場合はNone）
+    """
+    if _STALE_READ_SECONDS <= 0:
+        return None
+    return datetime.now(dt_timezone.utc) - timedelta(seconds=_STALE_READ_SECONDS)
+
+
+async def _get_first_document(query, read_time: Optional[datetime] = None):
+    """
+    クエリの先頭1件だけを取得する（見つからない場合はNone）
+
+    Args:
+        query: 対象のクエリ
+        read_time (Optional[datetime]): 指定した場合はその時点のデータを読む
+    """
+    stream_kwargs = {"retry": _READ_RETRY}
+    if read_time is not None:
+        stream_kwargs["read_time"] = read_time
+    docs = query.limit(1).stream(**stream_kwargs)
+    try:
+        return await anext(docs, None)
+    finally:
+        await docs.aclose()
+
+
+# 全件走査するクエリの1回あたりの取得件数
+_SCAN_PAGE_SIZE = 200
+# 全件走査の1ページあたりのタイムアウト（秒）。応答が詰まったページで走査全体が止まらないようにする
+_SCAN_PAGE_TIMEOUT_SECONDS = 30.0
+
+
+async def _iter_documents(query, page_size: int = _SCAN_PAGE_SIZE):
+    """
+    クエリ結果をドキュメント名順に page_size 件ずつページングしながら1件ずつ返す
+
+    1回のレスポンスが大きくなりすぎないよう、全件走査ではこちらを使う。
+    """
+    page_query = query.order_by("__name__").limit(page_size)
+    last_doc = None
+    while True:
+        page = page_query if last_doc is None else page_query.start_after(last_doc)
+        count = 0
+        async for doc in page.stream(
+            retry=_READ_RETRY, timeout=_SCAN_PAGE_TIMEOUT_SECONDS
+        ):
+            count += 1
+            last_doc = doc
+            yield doc
+        if count < page_size:
+            return
+
+
+# 1リクエスト内で取得済みのドキュメント（path -> DocumentSnapshot）
+# ツール関数の入口で空の辞書をセットした場合のみ有効になる
+_request_ref_cache: contextvars.ContextVar[Optional[dict[str, Any]]] = (
+    contextvars.ContextVar("_request_ref_cache", default=None)
+)
+
+
+async def _get_all_snapshots(db, refs: dict[str, Any]) -> dict[str, Any]:
+    """
+    DocumentReference をまとめて取得する（リクエスト内キャッシュにあるものは再取得しない）
+
+    Args:
+        db: Firestoreクライアント
+        refs (dict[str, Any]): path -> DocumentReference
+
+    Returns:
+        dict[str, Any]: path -> DocumentSnapshot
+    """
+    ref_cache = _request_ref_cache.get()
+    snapshots = {}
+    missing_refs = []
+    for path, ref in refs.items():
+        if ref_cache is not None and path in ref_cache:
+            snapshots[path] = ref_cache[path]
+        else:
+            missing_refs.append(ref)
+
+    if missing_refs:
+        async for snapshot in db.get_all(missing_refs, retry=_READ_RETRY):
+            snapshots[snapshot.reference.path] = snapshot
+            if ref_cache is not None:
+                ref_cache[snapshot.reference.path] = snapshot
+    return snapshots
+
+
+# Firestore の WriteBatch 1回あたりの書き込み上限
+_BATCH_WRITE_LIMIT = 500
+
+
+async def _commit_in_batches(
+    db,
+    writes: list[tuple[Any, dict]],
+    chunk: int = _BATCH_WRITE_LIMIT,
+    merge: bool = False,
+) -> None:
+    """
+    (DocumentReference, data) の set をまとめて WriteBatch でコミットする
+
+    chunk 件ごとに1回コミットするので、書き込みが多くても上限を超えない。
+    merge=True の場合は data のフィールドだけを既存ドキュメントに書き込む。
+    """
+    batch = db.batch()
+    staged = 0
+    for doc_ref, data in writes:
+        batch.set(doc_ref, data, merge=merge)
+        staged += 1
+        if staged >= chunk:
+            await batch.commit()
+            batch = db.batch()
+            staged = 0
+    if staged:
+        await batch.commit()
+
+# 読み取り結果のキャッシュ（多少の古さを許容し、TTLで上限を設ける）
+# TTL と件数の上限は環境変数で調整できる（TTL を 0 にするとキャッシュしない）
+_CACHE_TTL_SECONDS = FIRESTORE_CACHE_TTL_SECONDS
+_CACHE_MAXSIZE = FIRESTORE_CACHE_MAXSIZE
+_cached_functions: list = []
+
+
+def _ttl_cache(func=None, *, cacheable: Optional[Callable[[Any], bool]] = None):
+    """
+    非同期関数の結果を位置引数ごとにTTL付きLRUでキャッシュする
+
+    呼び出し側が結果を書き換えても影響しないよう、保存時と返却時にコピーする。
+    同じ引数の取得が並行して走っている間は、後続の呼び出しはその結果を待って共有する。
+    第1引数がメールアドレスの関数は invalidate_cache(email) でそのユーザーの分だけ破棄できる
+    （それ以外の関数は invalidate_cache() で全て破棄する）。
+
+    Args:
+        cacheable (Optional[Callable[[Any], bool]]): 結果をキャッシュしてよいかの判定。
+            error 付きの辞書はこの指定によらずキャッシュしない
     """
+    if func is None:
+        return functools.partial(_ttl_cache, cacheable=cacheable)
+
+    cache: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+    inflight: dict[tuple, asyncio.Future] = {}
+
+    async def _load(args: tuple) -> tuple[Any, Any]:
+        generation = wrapper.generation
+        started_at = time.monotonic()
+        result = await func(*args)
+        snapshot = copy.deepcopy(result)
+
+        # 取得に失敗した結果（error付きの辞書）や、取得中に破棄された結果はキャッシュしない
+        if (
+            generation == wrapper.generation
+            and not (isinstance(result, dict) and "error" in result)
+            and (cacheable is None or cacheable(result))
+        ):
+            cache[args] = (started_at, snapshot)
+            cache.move_to_end(args)
+            if len(cache) > _CACHE_MAXSIZE:
+                cache.popitem(last=False)
+        return result, snapshot
+
+    @functools.wraps(func)
+    async def wrapper(*args):
+        entry = cache.get(args)
+        if entry is not None and time.monotonic() - entry[0] < _CACHE_TTL_SECONDS:
+            cache.move_to_end(args)
+            return copy.deepcopy(entry[1])
+
+        pending = inflight.get(args)
+        if pending is not None:
+            _, snapshot = await asyncio.shield(pending)
+            return copy.deepcopy(snapshot)
+
+        pending = asyncio.ensure_future(_load(args))
+        inflight[args] = pending
+        pending.add_done_callback(
+            lambda done: inflight.pop(args, None) if inflight.get(args) is done else None
+        )
+        result, _ = await asyncio.shield(pending)
+        return result
+
+    wrapper.cache = cache
+    wrapper.inflight = inflight
+    wrapper.generation = 0
+    _cached_functions.append(wrapper)
+    return wrapper
+
+
+def invalidate_cache(email: Optional[str] = None) -> None:
+    """
+    読み取りキャッシュを破棄する
+
+    Firestoreへの書き込み後に呼び出す。
+
+    Args:
+        email (Optional[str]): 対象ユーザーのメールアドレス。Noneの場合は全て破棄
+    """
+    for cached in _cached_functions:
+        # 取得中の結果は書き込み前の値の可能性があるので、キャッシュさせず共有もしない
+        cached.generation += 1
+        if email is None:
+            cached.cache.clear()
+            cached.inflight.clear()
+            continue
+        # 引数のない関数（キーが空のタプル）もあるので、先頭要素はスライスで比べる
+        for key in [key for key in cached.cache if key[:1] == (email,)]:
+            del cached.cache[key]
+        for key in [key for key in cached.inflight if key[:1] == (email,)]:
+            del cached.inflight[key]
+
+
+# 変換不要な型（値の大半を占めるので、関数呼び出しを挟まずにそのまま使う）
+_CLEAN_ATOMIC_TYPES = frozenset((str, int, float, bool))
+
+
+def _clean_dict(data: dict) -> dict:
+    cleaned = {}
+    for key, value in data.items():
+        value_type = type(value)
+        if value_type in _CLEAN_ATOMIC_TYPES:
+            cleaned[key] = value
+            continue
+        cleaned_value = _CLEAN_DISPATCH.get(value_type, _clean_other)(value)
+        if cleaned_value is not None:  # Noneでない値のみ追加
+            cleaned[key] = cleaned_value
+    return cleaned
+
+
+def _clean_list(data: list) -> list:
+    # 要素ごとに1回だけ変換し、Noneになったものを除く
+    cleaned = []
+    for item in data:
+        item_type = type(item)
+        if item_type in _CLEAN_ATOMIC_TYPES:
+            cleaned.append(item)
+            continue
+        cleaned_item = _CLEAN_DISPATCH.get(item_type, _clean_other)(item)
+        if cleaned_item is not None:
+            cleaned.append(cleaned_item)
+    return cleaned
+
+
+def _clean_identity(data: Any) -> Any:
+    return data
+
+
+def _clean_other(data: Any) -> Any:
     if isinstance(data, dict):
-        cleaned = {}
-        for key, value in data.items():
-            cleaned_value = _clean_firestore_data(value)
-            if cleaned_value is not None:  # Noneでない値のみ追加
-                cleaned[key] = cleaned_value
-        return cleaned
+        return _clean_dict(data)
     elif isinstance(data, list):
-        return [_clean_firestore_data(item) for item in data if _clean_firestore_data(item) is not None]
-    elif hasattr(data, '_document_path'):  # DocumentReference
+        return _clean_list(data)
+    elif isinstance(data, BaseDocumentReference):
         # DocumentReferenceの場合はパスを文字列として返す
-        return str(data.path) if hasattr(data, 'path') else str(data)
-    elif hasattr(data, 'timestamp'):  # Timestamp
+        return data.path
+    elif isinstance(data, datetime):  # Timestamp (DatetimeWithNanoseconds)
         # Timestampの場合はISO文字列に変換
-        return data.isoformat() if hasattr(data, 'isoformat') else str(data)
+        return data.isoformat()
     elif isinstance(data, (str, int, float, bool)) or data is None:
         return data
     else:
         # その他のオブジェクトは文字列化
         try:
             # JSON化を試行
-            import json
             json.dumps(data)
             return data
         except (TypeError, ValueError):
             return str(data)
 
 
-def _get_subtasks_recursively(
+# 型が完全一致する場合はisinstanceの連鎖を通さずに変換関数を選ぶ
+_CLEAN_DISPATCH = {
+    dict: _clean_dict,
+    list: _clean_list,
+    str: _clean_identity,
+    int: _clean_identity,
+    float: _clean_identity,
+    bool: _clean_identity,
+    type(None): _clean_identity,
+}
+
+
+def _clean_firestore_data(data: Any) -> Any:
+    """
+    FirestoreのデータからJSON化できないオブジェクトを除去・変換する
+    """
+    data_type = type(data)
+    if data_type in _CLEAN_ATOMIC_TYPES or data is None:
+        return data
+    return _CLEAN_DISPATCH.get(data_type, _clean_other)(data)
+
+
+def _json_default(data: Any) -> Any:
+    # クリーニングを通さない値に残った Timestamp は、_clean_other と同じくISO文字列にする
+    if isinstance(data, datetime):
+        return data.isoformat()
+    raise TypeError(f"Object of type {type(data).__name__} is not JSON serializable")
+
+
+def _dumps_cleaned(cleaned: Any) -> str:
+    return json.dumps(
+        cleaned, ensure_ascii=False, separators=(",", ":"), default=_json_default
+    )
+
+
+def _iter_json_chunks(data: Any):
+    """
+    トップレベルの辞書・リストを要素ごとにクリーニング・JSON化して断片を返す
+
+    返却値全体のクリーニング済みコピーを作らないので、大きな結果でもメモリのピークが低い。
+    """
+    if type(data) is list:
+        yield "["
+        separator = ""
+        for item in data:
+            cleaned_item = _clean_firestore_data(item)
+            if cleaned_item is None:
+                continue
+            yield separator
+            yield _dumps_cleaned(cleaned_item)
+            separator = ","
+        yield "]"
+    elif type(data) is dict:
+        yield "{"
+        separator = ""
+        for key, value in data.items():
+            if type(value) is list or type(value) is dict:
+                yield f"{separator}{_dumps_cleaned(str(key))}:"
+                yield from _iter_json_chunks(value)
+            else:
+                cleaned_value = _clean_firestore_data(value)
+                if cleaned_value is None:
+                    continue
+                yield f"{separator}{_dumps_cleaned(str(key))}:"
+                yield _dumps_cleaned(cleaned_value)
+            separator = ","
+        yield "}"
+    else:
+        yield _dumps_cleaned(_clean_firestore_data(data))
+
+
+def _dumps_result(result: Any) -> str:
+    """
+    ツールの返却値をJSON文字列に変換する（DocumentReference等は事前に文字列化）
+    """
+    return "".join(_iter_json_chunks(result))
+
+
+async def _get_subtasks_recursively(
     task_doc_ref, db, level=1, max_level=3
 ) -> list[dict[str, Any]]:
     """
     タスクドキュメントからサブタスクを再帰的に取得する
 
+    配下の subTasks を collection_group クエリ1回でまとめて取得し、階層はパスから組み立てる。
+    クエリに失敗した場合は階層ごとに取得する方式にフォールバックする。
+
     Args:
-        task_doc_ref (firestore.DocumentReference): 親タスクのFirestoreドキュメント参照
-        db (firestore.Client): Firestoreクライアント
+        task_doc_ref (firestore.AsyncDocumentReference): 親タスクのFirestoreドキュメント参照
+        db (firestore.AsyncClient): Firestoreクライアント
         level (int, optional): 現在のネストレベル（直接のサブタスクは1から開始）. Defaults to 1.
         max_level (int, optional): 無限再帰を防ぐための最大ネストレベル. Defaults to 3.
 
@@ -66,15 +443,92 @@ def _get_subtasks_recursively(
         list[dict[str, Any]]: 階層情報を含むサブタスク辞書のリスト
     """
     if level > max_level:
-        print(f"   ⚠️  Max nesting level ({max_level}) reached, stopping recursion")
+        logger.debug("Max nesting level (%d) reached, stopping recursion", max_level)
         return []
 
     try:
-        subtasks = []
+        # task_doc_ref 配下の全 subTasks をドキュメント名の範囲で絞り込む
+        subtree_query = (
+            db.collection_group("subTasks")
+            .where(filter=FieldFilter("__name__", ">", task_doc_ref))
+            .where(
+                filter=FieldFilter(
+                    "__name__", "<", db.document(task_doc_ref.path + "\uf8ff")
+                )
+            )
+        )
+        prefix = task_doc_ref.path + "/"
+
+        # 親のパス -> 子サブタスク（名前順なので兄弟の順序は subTasks の stream() と同じ）
+        children: dict[str, list] = {}
+        async for subtask_doc in subtree_query.stream(retry=_READ_RETRY):
+            # 同じ接頭辞を持つ別タスク（例: T1 に対する T10）の配下は除外
+            if not subtask_doc.exists or not subtask_doc.reference.path.startswith(prefix):
+                continue
+            parent_path = subtask_doc.reference.parent.parent.path
+            children.setdefault(parent_path, []).append(subtask_doc)
+
+    except Exception as e:
+        logger.warning("Subtask subtree query failed, falling back to per-level reads: %s", e)
+        return await _get_subtasks_by_level(task_doc_ref, db, level, max_level)
+
+    # 親 → その子孫 の順序（深さ優先）で平坦化
+    subtasks = []
+
+    def _append_children(parent_path: str, current_level: int) -> None:
+        if current_level > max_level:
+            if parent_path in children:
+                logger.debug(
+                    "Max nesting level (%d) reached, stopping recursion", max_level
+                )
+            return
+
+        for subtask_doc in children.get(parent_path, []):
+            subtask_dict = subtask_doc.to_dict()
+            subtask_dict["taskId"] = subtask_doc.id
+            subtask_dict["taskPath"] = subtask_doc.reference.path
+            subtask_dict["isSubTask"] = True
+            subtask_dict["parentTaskPath"] = parent_path
+            subtask_dict["nestingLevel"] = current_level
+
+            logger.debug(
+                "Found subtask: %s (level %d)",
+                subtask_dict.get("title", "No title"),
+                current_level,
+            )
+
+            subtasks.append(subtask_dict)
+            _append_children(subtask_doc.reference.path, current_level + 1)
+
+    _append_children(task_doc_ref.path, level)
+    return subtasks
+
+
+async def _get_subtasks_by_level(
+    task_doc_ref, db, level=1, max_level=3
+) -> list[dict[str, Any]]:
+    """
+    タスクドキュメントからサブタスクを階層ごとに再帰的に取得する（1親につき1回のクエリ）
+
+    Args:
+        task_doc_ref (firestore.AsyncDocumentReference): 親タスクのFirestoreドキュメント参照
+        db (firestore.AsyncClient): Firestoreクライアント
+        level (int, optional): 現在のネストレベル（直接のサブタスクは1から開始）. Defaults to 1.
+        max_level (int, optional): 無限再帰を防ぐための最大ネストレベル. Defaults to 3.
+
+    Returns:
+        list[dict[str, Any]]: 階層情報を含むサブタスク辞書のリスト
+    """
+    if level > max_level:
+        logger.debug("Max nesting level (%d) reached, stopping recursion", max_level)
+        return []
+
+    try:
+        found = []
         subtasks_collection = task_doc_ref.collection("subTasks")
-        subtask_docs = subtasks_collection.stream()
+        subtask_docs = subtasks_collection.stream(retry=_READ_RETRY)
 
-        for subtask_doc in subtask_docs:
+        async for subtask_doc in subtask_docs:
             if subtask_doc.exists:
                 subtask_dict = subtask_doc.to_dict()
                 subtask_dict["taskId"] = subtask_doc.id
@@ -83,26 +537,34 @@ def _get_subtasks_recursively(
                 subtask_dict["parentTaskPath"] = task_doc_ref.path
                 subtask_dict["nestingLevel"] = level
 
-                print(
-                    f"   {'  ' * level}📋 Found subtask: {subtask_dict.get('title', 'No title')} (level {level})"
+                logger.debug(
+                    "Found subtask: %s (level %d)", subtask_dict.get("title", "No title"), level
                 )
 
-                subtasks.append(subtask_dict)
+                found.append((subtask_dict, subtask_doc.reference))
 
-                # Recursively get sub-subtasks
-                nested_subtasks = _get_subtasks_recursively(
-                    subtask_doc.reference, db, level + 1, max_level
-                )
-                subtasks.extend(nested_subtasks)
+        # Recursively get sub-subtasks (兄弟のサブツリーは並行して取得)
+        nested_lists = await asyncio.gather(
+            *(
+                _get_subtasks_by_level(subtask_ref, db, level + 1, max_level)
+                for _, subtask_ref in found
+            )
+        )
 
+        # 親 → その子孫 の順序（深さ優先）を保って平坦化
+        subtasks = []
+        for (subtask_dict, _), nested_subtasks in zip(found, nested_lists):
+            subtasks.append(subtask_dict)
+            subtasks.extend(nested_subtasks)
         return subtasks
 
     except Exception as e:
-        print(f"   ❌ Error getting subtasks at level {level}: {str(e)}")
+        logger.error("Error getting subtasks at level %d: %s", level, e)
         return []
 
 
-def _get_user_context(
+@_ttl_cache
+async def _get_user_context(
     email_of_the_conversation_partner: str,
 ) -> dict[str, Any]:
     """
@@ -115,31 +577,83 @@ def _get_user_context(
         dict[str, Any]: ユーザーコンテキストを含む辞書、見つからない場合は空の辞書
     """
     try:
-        db = _db_client
+        db = _get_db()
         collection_ref = (
             db.collection("users")
             .document(email_of_the_conversation_partner)
             .collection("userContexts")
         )
-        docs = (
-            collection_ref.order_by("createdAt", direction=firestore.Query.DESCENDING)
-            .limit(1)
-            .stream()
+        doc = await _get_first_document(
+            collection_ref.order_by("createdAt", direction=firestore.Query.DESCENDING),
+            read_time=_stale_read_time(),
         )
-
-        for doc in docs:
-            logger.debug(doc.to_dict())
-            if doc.exists:
-                return doc.to_dict()
+        if doc is not None and doc.exists:
+            context = doc.to_dict()
+            logger.debug(context)
+            return context
 
         return {}
 
     except Exception as e:
-        print(f"Error retrieving user context: {str(e)}")
+        logger.error("Error retrieving user context: %s", e)
         return {"error": f"Failed to retrieve user context: {str(e)}"}
 
 
-def _get_project_context(
+async def _resolve_project_infos(db, contexts: list[dict[str, Any]]) -> None:
+    """
+    projectContexts の projectInfo と members[].userRef の DocumentReference を解決する
+
+    参照ごとに get() せず、全コンテキスト分の参照を get_all でまとめて取得し、
+    各コンテキストを直接書き換える。同じリクエスト内で取得済みの参照は再取得しない。
+
+    Args:
+        db: Firestoreクライアント
+        contexts (list[dict[str, Any]]): projectContexts のドキュメント内容のリスト
+    """
+    project_refs = {
+        context["projectInfo"].path: context["projectInfo"]
+        for context in contexts
+        if isinstance(context.get("projectInfo"), BaseDocumentReference)
+    }
+    project_snapshots = await _get_all_snapshots(db, project_refs)
+
+    for context in contexts:
+        if not isinstance(context.get("projectInfo"), BaseDocumentReference):
+            continue
+        snapshot = project_snapshots.get(context["projectInfo"].path)
+        if snapshot is not None and snapshot.exists:
+            # to_dict() は毎回コピーを返すので、同じプロジェクトでもコンテキストごとに独立する
+            context["projectInfo"] = snapshot.to_dict()
+            context["projectInfo"]["id"] = snapshot.id
+        else:
+            # プロジェクトが見つからない場合はNoneに設定
+            context["projectInfo"] = None
+
+    # members の userRef も全コンテキスト分をまとめて解決
+    member_user_refs = {}
+    for context in contexts:
+        for member in (context.get("projectInfo") or {}).get("members", []):
+            if isinstance(member, dict) and isinstance(
+                member.get("userRef"), BaseDocumentReference
+            ):
+                member_user_refs[member["userRef"].path] = member["userRef"]
+    member_user_snapshots = await _get_all_snapshots(db, member_user_refs)
+
+    for context in contexts:
+        for member in (context.get("projectInfo") or {}).get("members", []):
+            if isinstance(member, dict) and isinstance(
+                member.get("userRef"), BaseDocumentReference
+            ):
+                snapshot = member_user_snapshots.get(member["userRef"].path)
+                if snapshot is not None and snapshot.exists:
+                    member["userRef"] = snapshot.to_dict()
+                    member["userRef"]["id"] = snapshot.id
+                else:
+                    member["userRef"] = None
+
+
+@_ttl_cache
+async def _get_project_context(
     email_of_the_conversation_partner: str,
 ) -> dict[str, Any]:
     """
@@ -152,53 +666,31 @@ def _get_project_context(
         dict[str, Any]: プロジェクトコンテキストを含む辞書、見つからない場合は空の辞書
     """
     try:
-        db = _db_client
+        db = _get_db()
         collection_ref = (
             db.collection("users")
             .document(email_of_the_conversation_partner)
             .collection("projectContexts")
         )
 
-        docs = collection_ref.limit(1).stream()
-        for doc in docs:
-            if doc.exists:
-                context = doc.to_dict()
+        doc = await _get_first_document(collection_ref, read_time=_stale_read_time())
+        if doc is not None and doc.exists:
+            context = doc.to_dict()
 
-                # projectInfo の DocumentReference を解決
-                if "projectInfo" in context and hasattr(context["projectInfo"], "get"):
-                    project_ref = context["projectInfo"]
-                    project_doc = project_ref.get()
-                    if project_doc.exists:
-                        context["projectInfo"] = project_doc.to_dict()
-                        context["projectInfo"]["id"] = project_doc.id
-
-                        # members の userRef も解決
-                        if "members" in context["projectInfo"]:
-                            for member in context["projectInfo"]["members"]:
-                                if isinstance(member, dict) and "userRef" in member:
-                                    user_ref = member["userRef"]
-                                    if hasattr(user_ref, "get"):
-                                        user_doc = user_ref.get()
-                                        if user_doc.exists:
-                                            member["userRef"] = user_doc.to_dict()
-                                            member["userRef"]["id"] = user_doc.id
-                                        else:
-                                            member["userRef"] = None
-                    else:
-                        # プロジェクトが見つからない場合はNoneに設定
-                        context["projectInfo"] = None
-
-                logger.info(context)
-                return context
+            # projectInfo と members の userRef を解決
+            await _resolve_project_infos(db, [context])
+
+            logger.info(context)
+            return context
 
         return {}
 
     except Exception as e:
-        print(f"Error retrieving user context: {str(e)}")
+        logger.error("Error retrieving user context: %s", e)
         return {"error": f"Failed to retrieve user context: {str(e)}"}
 
 
-def firestore_get_user_context(email_of_the_conversation_partner: str) -> str:
+async def firestore_get_user_context(email_of_the_conversation_partner: str) -> str:
     """
     Firestoreからユーザーコンテキストを取得する
 
@@ -208,14 +700,14 @@ def firestore_get_user_context(email_of_the_conversation_partner: str) -> str:
     Returns:
         str: 文字列形式のユーザーコンテキスト、見つからない場合は "None"
     """
-    result = _get_user_context(email_of_the_conversation_partner)
+    result = await _get_user_context(email_of_the_conversation_partner)
     # 空の辞書の場合は "None" を返す（project_analyzer_agentのOptional[UserContext]として処理される）
     if not result or result == {}:
         return "None"
-    return str(result)
+    return _dumps_result(result)
 
 
-def firestore_get_project_context(email_of_the_conversation_partner: str) -> str:
+async def firestore_get_project_context(email_of_the_conversation_partner: str) -> str:
     """
     Firestoreからプロジェクトコンテキストを取得する
 
@@ -225,16 +717,26 @@ def firestore_get_project_context(email_of_the_conversation_partner: str) -> str
     Returns:
         str: 文字列形式のプロジェクトコンテキスト、見つからない場合は "None"
     """
-    result = _get_project_context(email_of_the_conversation_partner)
-    print("------_get_project_context")
-    print(result)
+    result = await _get_project_context(email_of_the_conversation_partner)
+    logger.debug("_get_project_context: %s", result)
     # 空の辞書の場合は "None" を返す（project_analyzer_agentのOptional[UserContext]として処理される）
     if not result or result == {}:
         return "None"
-    return str(result)
+    return _dumps_result(result)
+
+
+def _team_member_email(member: Any) -> Optional[str]:
+    """
+    プロジェクトの members の要素（userRef を持つ辞書 / DocumentReference）からメールアドレスを取得する
+    """
+    if isinstance(member, BaseDocumentReference):
+        return _email_from_ref(member)
+    if isinstance(member, dict):
+        return _member_user_email(member)
+    return None
 
 
-def _get_team_contexts(
+async def _get_team_contexts(
     project_id: str, collection_name: str, order_by_created_at: bool = False
 ) -> list:
     """
@@ -248,31 +750,79 @@ def _get_team_contexts(
     Returns:
         list: チームメンバー全員のコンテキストリスト
     """
+    team_contexts, _ = await _get_team_contexts_page(
+        project_id, collection_name, order_by_created_at
+    )
+    return team_contexts
+
+
+async def _get_team_contexts_page(
+    project_id: str,
+    collection_name: str,
+    order_by_created_at: bool = False,
+    page_size: Optional[int] = None,
+    start_after: Optional[str] = None,
+) -> tuple[list, Optional[str]]:
+    """
+    プロジェクトに参加しているメンバーのコンテキストを members の順に1ページ分取得
+
+    Args:
+        project_id (str): 参画しているプロジェクトのID
+        collection_name (str): 取得するコレクション名 ("userContexts" or "projectContexts")
+        order_by_created_at (bool, optional): createdAtで降順ソートするか. Defaults to False.
+        page_size (Optional[int], optional): 1ページのメンバー数。Noneの場合は全員. Defaults to None.
+        start_after (Optional[str], optional): 前のページの next_cursor（最後のメンバーのメールアドレス）. Defaults to None.
+
+    Returns:
+        tuple[list, Optional[str]]: コンテキストのリストと、続きがある場合の次のカーソル
+    """
     try:
-        db = _db_client
+        db = _get_db()
 
         # プロジェクトドキュメントを取得
-        project_doc = db.document(f"projects/{project_id}").get()
+        # projectContexts 以外では projectInfo を解決しないので members だけ転送する
+        resolve_project_info = collection_name == "projectContexts"
+        project_doc = await db.document(f"projects/{project_id}").get(
+            field_paths=None if resolve_project_info else ["members"],
+            retry=_READ_RETRY,
+        )
         if not project_doc.exists:
-            print(f"❌ Project not found: {project_id}")
-            return []
+            logger.warning("Project not found: %s", project_id)
+            return [], None
 
-        members = project_doc.to_dict().get("members", [])
-        print(f"👥 Found {len(members)} members in project {project_id}")
+        # projectContexts の projectInfo 解決で同じプロジェクトを再取得しないよう登録
+        ref_cache = _request_ref_cache.get()
+        if resolve_project_info and ref_cache is not None:
+            ref_cache[project_doc.reference.path] = project_doc
 
-        team_contexts = []
+        members = project_doc.to_dict().get("members", [])
+        logger.debug("Found %d members in project %s", len(members), project_id)
+
+        # ページング: start_after のメンバーの次から page_size 人分だけコンテキストを取得する
+        if start_after is not None:
+            member_emails = [_team_member_email(member) for member in members]
+            if start_after in member_emails:
+                members = members[member_emails.index(start_after) + 1 :]
+            else:
+                logger.warning(
+                    "Cursor member %s not found in project %s", start_after, project_id
+                )
+                members = []
+        next_cursor = None
+        if page_size is not None and 0 < page_size < len(members):
+            members = members[:page_size]
+            next_cursor = _team_member_email(members[-1])
 
-        # 各メンバーのコンテキストを取得
-        for member in members:
+        async def _get_member_context(member) -> Optional[dict]:
             try:
                 # ユーザー参照を取得
-                if hasattr(member, "path"):
+                if isinstance(member, BaseDocumentReference):
                     user_ref = member
                 elif isinstance(member, dict) and "userRef" in member:
                     user_ref = member["userRef"]
                 else:
-                    print(f"⚠️  Unexpected member format: {member}")
-                    continue
+                    logger.warning("Unexpected member format: %s", member)
+                    return None
 
                 # users/{email}のDocumentReferenceから指定されたコレクションにアクセス
                 user_doc_ref = user_ref.parent.parent  # userProfiles -> users/{email}
@@ -281,71 +831,45 @@ def _get_team_contexts(
                 contexts_ref = user_doc_ref.collection(collection_name)
 
                 if order_by_created_at:
-                    docs = list(
+                    doc = await _get_first_document(
                         contexts_ref.order_by(
                             "createdAt", direction=firestore.Query.DESCENDING
                         )
-                        .limit(1)
-                        .stream()
                     )
                 else:
-                    docs = list(contexts_ref.limit(1).stream())
-
-                if docs and docs[0].exists:
-                    context = docs[0].to_dict()
-                    email = user_doc_ref.id
-                    context["userEmail"] = email
-
-                    # projectContexts の場合、projectInfo の DocumentReference を解決
-                    if (
-                        collection_name == "projectContexts"
-                        and "projectInfo" in context
-                        and hasattr(context["projectInfo"], "get")
-                    ):
-                        project_ref = context["projectInfo"]
-                        project_doc = project_ref.get()
-                        if project_doc.exists:
-                            context["projectInfo"] = project_doc.to_dict()
-                            context["projectInfo"]["id"] = project_doc.id
-
-                            # members の userRef も解決
-                            if "members" in context["projectInfo"]:
-                                for member in context["projectInfo"]["members"]:
-                                    if isinstance(member, dict) and "userRef" in member:
-                                        member_user_ref = member["userRef"]
-                                        if hasattr(member_user_ref, "get"):
-                                            member_user_doc = member_user_ref.get()
-                                            if member_user_doc.exists:
-                                                member["userRef"] = (
-                                                    member_user_doc.to_dict()
-                                                )
-                                                member["userRef"]["id"] = (
-                                                    member_user_doc.id
-                                                )
-                                            else:
-                                                member["userRef"] = None
-                        else:
-                            context["projectInfo"] = None
-
-                    team_contexts.append(context)
-                else:
-                    email = (
-                        user_doc_ref.id if hasattr(user_doc_ref, "id") else "unknown"
-                    )
+                    doc = await _get_first_document(contexts_ref)
+
+                if doc is None or not doc.exists:
+                    return None
+
+                context = doc.to_dict()
+                email = user_doc_ref.id
+                context["userEmail"] = email
+                return context
 
             except Exception as e:
-                print(f"⚠️  Error processing member: {e}")
-                continue
+                logger.warning("Error processing member: %s", e)
+                return None
+
+        # 各メンバーのコンテキストを並行して取得
+        results = await asyncio.gather(
+            *(_get_member_context(member) for member in members)
+        )
+        team_contexts = [context for context in results if context is not None]
+
+        # projectContexts の場合、projectInfo の DocumentReference をまとめて解決
+        if resolve_project_info:
+            await _resolve_project_infos(db, team_contexts)
 
-        print(f"📊 Retrieved {len(team_contexts)} {collection_name}")
-        return team_contexts
+        logger.info("Retrieved %d %s", len(team_contexts), collection_name)
+        return team_contexts, next_cursor
 
     except Exception as e:
-        print(f"❌ Error retrieving team {collection_name}: {e}")
-        return []
+        logger.error("Error retrieving team %s: %s", collection_name, e)
+        return [], None
 
 
-def _get_team_project_contexts(project_id: str) -> list:
+async def _get_team_project_contexts(project_id: str) -> list:
     """
     プロジェクトに参加している全メンバーのprojectContextを取得
 
@@ -355,10 +879,10 @@ def _get_team_project_contexts(project_id: str) -> list:
     Returns:
         list: チームメンバー全員のプロジェクトコンテキストリスト
     """
-    return _get_team_contexts(project_id, "projectContexts")
+    return await _get_team_contexts(project_id, "projectContexts")
 
 
-def _get_team_user_contexts(project_id: str) -> list:
+async def _get_team_user_contexts(project_id: str) -> list:
     """
     プロジェクトに参加している全メンバーのuserContextを取得
 
@@ -368,10 +892,10 @@ def _get_team_user_contexts(project_id: str) -> list:
     Returns:
         list: チームメンバー全員のユーザーコンテキストリスト
     """
-    return _get_team_contexts(project_id, "userContexts", order_by_created_at=True)
+    return await _get_team_contexts(project_id, "userContexts", order_by_created_at=True)
 
 
-def firestore_get_team_user_contexts(
+async def firestore_get_team_user_contexts(
     email_of_the_conversation_partner: str,
     project_id: str,
 ) -> str:
@@ -390,30 +914,34 @@ def firestore_get_team_user_contexts(
     """
     try:
         # 個人のuserContextを取得
-        individual_context = _get_user_context(email_of_the_conversation_partner)
+        individual_context = await _get_user_context(email_of_the_conversation_partner)
 
         if not individual_context or individual_context == {}:
             return "None"
 
         # チーム全体のuserContextsを取得
-        team_contexts = _get_team_user_contexts(project_id)
+        team_contexts = await _get_team_user_contexts(project_id)
 
         result = {
             "individual_context": individual_context,
             "team_contexts": team_contexts,
         }
 
-        print(
-            f"📊 Retrieved {len(team_contexts)} team user contexts for project {project_id}"
+        logger.info(
+            "📊 Retrieved %d team user contexts for project %s", len(team_contexts), project_id
         )
-        return str(result)
+        return _dumps_result(result)
 
     except Exception as e:
-        print(f"❌ Error retrieving team user contexts: {e}")
+        logger.error("❌ Error retrieving team user contexts: %s", e)
         return "None"
 
 
-def firestore_get_project_members(project_id: str) -> str:
+async def firestore_get_project_members(
+    project_id: str,
+    page_size: Optional[int] = None,
+    start_after: Optional[str] = None,
+) -> str:
     """
     プロジェクトの全メンバーのuserContextsを取得（個人コンテキストチェックなし）
 
@@ -421,30 +949,43 @@ def firestore_get_project_members(project_id: str) -> str:
     各プロジェクトのメンバーリストを取得するために使用します。
     email_of_the_conversation_partnerパラメータが不要なため、システムから呼び出せます。
 
+    page_size を指定した場合はメンバーを page_size 人ずつ返し、続きがあれば next_cursor を含める。
+    次のページは start_after に next_cursor を渡して取得する。
+
     Args:
         project_id (str): プロジェクトのID
+        page_size (Optional[int]): 1回に返すメンバー数（省略時は全員）
+        start_after (Optional[str]): 前回の next_cursor
 
     Returns:
         str: チームメンバー全員のuserContextsを含むJSON文字列
     """
     try:
-        # チーム全体のuserContextsを取得
-        team_contexts = _get_team_user_contexts(project_id)
+        # チーム全体（またはそのページ）のuserContextsを取得
+        team_contexts, next_cursor = await _get_team_contexts_page(
+            project_id,
+            "userContexts",
+            order_by_created_at=True,
+            page_size=page_size,
+            start_after=start_after,
+        )
 
-        if not team_contexts:
+        if not team_contexts and next_cursor is None:
             return "No members found"
 
         result = {"team_contexts": team_contexts}
+        if next_cursor is not None:
+            result["next_cursor"] = next_cursor
 
-        print(f"📊 Retrieved {len(team_contexts)} members for project {project_id}")
-        return str(result)
+        logger.info("📊 Retrieved %d members for project %s", len(team_contexts), project_id)
+        return _dumps_result(result)
 
     except Exception as e:
-        print(f"❌ Error retrieving project members: {e}")
+        logger.error("❌ Error retrieving project members: %s", e)
         return "No members found"
 
 
-def firestore_get_team_project_contexts(
+async def firestore_get_team_project_contexts(
     email_of_the_conversation_partner: str,
     project_id: str,
 ) -> str:
@@ -461,32 +1002,36 @@ def firestore_get_team_project_contexts(
     Returns:
         str: 個人のprojectContextとチーム全体のprojectContextsを含むJSON文字列
     """
+    # 個人とチームで共通するプロジェクト・メンバーの参照は1回だけ取得する
+    ref_cache_token = _request_ref_cache.set({})
     try:
         # 個人のprojectContextを取得
-        individual_context = _get_project_context(email_of_the_conversation_partner)
+        individual_context = await _get_project_context(email_of_the_conversation_partner)
 
         if not individual_context or individual_context == {}:
             return "None"
 
         # チーム全体のprojectContextsを取得
-        team_contexts = _get_team_project_contexts(project_id)
+        team_contexts = await _get_team_project_contexts(project_id)
 
         result = {
             "individual_context": individual_context,
             "team_contexts": team_contexts,
         }
 
-        print(
-            f"📊 Retrieved {len(team_contexts)} team project contexts for project {project_id}"
+        logger.info(
+            "📊 Retrieved %d team project contexts for project %s", len(team_contexts), project_id
         )
-        return str(result)
+        return _dumps_result(result)
 
     except Exception as e:
-        print(f"❌ Error retrieving team project contexts: {e}")
+        logger.error("❌ Error retrieving team project contexts: %s", e)
         return "None"
+    finally:
+        _request_ref_cache.reset(ref_cache_token)
 
 
-def _get_user_tasks(
+async def _get_user_tasks(
     email_of_the_conversation_partner: str,
     project_id: Optional[str] = None,
     include_completed: bool = True,
@@ -506,99 +1051,145 @@ def _get_user_tasks(
         list[dict[str, Any]]: タスクとサブタスクのリスト
     """
     try:
-        db = _db_client
+        db = _get_db()
         all_tasks = []
 
         # プロジェクトIDが指定されている場合は、そのプロジェクトのみ
         # 指定されていない場合は、ユーザーが参画している全プロジェクト
         if project_id:
             project_ids = [project_id]
-            print(f"📊 Retrieving tasks for project: {project_id}")
+            logger.debug("Retrieving tasks for project: %s", project_id)
         else:
             # ユーザーが参画している全プロジェクトを取得
-            user_projects = _get_user_projects(email_of_the_conversation_partner)
+            user_projects = await _get_user_projects(email_of_the_conversation_partner)
             project_ids = [p["projectId"] for p in user_projects]
-            print(f"📊 Retrieving tasks from {len(project_ids)} projects")
+            logger.debug("Retrieving tasks from %d projects", len(project_ids))
+
+        # assignee は文字列（メールアドレス）または配列（将来の互換性のため）
+        assignee_filter = Or(
+            [
+                FieldFilter("assignee", "==", email_of_the_conversation_partner),
+                FieldFilter(
+                    "assignee", "array_contains", email_of_the_conversation_partner
+                ),
+            ]
+        )
+        # プロジェクトごとに割り当てタスクをまとめる（結果はプロジェクト順に並べる）
+        assigned_tasks = {proj_id: [] for proj_id in project_ids}
+
+        async def _collect_assigned_tasks(tasks_query) -> None:
+            async for task_doc in tasks_query.where(filter=assignee_filter).stream(
+                retry=_READ_RETRY
+            ):
+                if not task_doc.exists:
+                    continue
+
+                # projects/{projectId}/tasks/{taskId} 以外や、参画していないプロジェクトは除外
+                project_ref = task_doc.reference.parent.parent
+                if project_ref is None or project_ref.id not in assigned_tasks:
+                    continue
+                if project_ref.parent.id != "projects":
+                    continue
+
+                task_dict = task_doc.to_dict()
+
+                # 完了済みタスクをスキップ（include_completedがFalseの場合）
+                if not include_completed and task_dict.get("status") == "completed":
+                    continue
+
+                assigned_tasks[project_ref.id].append((task_dict, task_doc.reference))
 
-        # 各プロジェクトからタスクを取得
-        for proj_id in project_ids:
+        async def _collect_project_tasks(proj_id: str) -> None:
             try:
-                # プロジェクトドキュメントを取得してプロジェクト名を確認
-                project_doc = db.collection("projects").document(proj_id).get()
-                project_name = "Unknown Project"
-                if project_doc.exists:
-                    project_data = project_doc.to_dict()
-                    project_name = project_data.get("projectName", proj_id)
-
-                # プロジェクトのtasksコレクションを取得
-                tasks_ref = (
+                await _collect_assigned_tasks(
                     db.collection("projects").document(proj_id).collection("tasks")
                 )
+            except Exception as e:
+                logger.error("Error retrieving tasks for project %s: %s", proj_id, e)
 
-                # 全タスクを取得
-                for task_doc in tasks_ref.stream():
-                    if not task_doc.exists:
-                        continue
-
-                    task_dict = task_doc.to_dict()
-
-                    # タスクに割り当てられているメンバーを確認
-                    assignee = task_dict.get("assignee", "")
-
-                    # assigneeが文字列（メールアドレス）の場合
-                    if isinstance(assignee, str):
-                        is_assigned = assignee == email_of_the_conversation_partner
-                    # assigneeが配列の場合（将来の互換性のため）
-                    elif isinstance(assignee, list):
-                        is_assigned = email_of_the_conversation_partner in assignee
-                    else:
-                        is_assigned = False
-
-                    # このユーザーに割り当てられていない場合はスキップ
-                    if not is_assigned:
-                        continue
-
-                    # 完了済みタスクをスキップ（include_completedがFalseの場合）
-                    if not include_completed and task_dict.get("status") == "completed":
-                        continue
-
-                    # メタデータを追加
-                    task_dict.update(
-                        {
-                            "taskId": task_doc.id,
-                            "projectId": proj_id,
-                            "projectName": project_name,
-                            "taskPath": task_doc.reference.path,
-                            "isSubTask": False,
-                            "nestingLevel": 0,
-                        }
-                    )
+        if project_id:
+            await _collect_assigned_tasks(
+                db.collection("projects").document(project_id).collection("tasks")
+            )
+        else:
+            try:
+                # プロジェクトごとに問い合わせず、全プロジェクトの tasks を1回のクエリで取得
+                await _collect_assigned_tasks(db.collection_group("tasks"))
+            except api_exceptions.FailedPrecondition as e:
+                # collection group 用のインデックス（assignee の除外設定）がない環境では
+                # プロジェクトごとの tasks へのクエリに切り替える
+                logger.warning(
+                    "tasks collection group query failed, falling back to per-project reads: %s", e
+                )
+                for tasks in assigned_tasks.values():
+                    tasks.clear()
+                await asyncio.gather(
+                    *(_collect_project_tasks(proj_id) for proj_id in project_ids)
+                )
 
-                    all_tasks.append(task_dict)
-                    print(
-                        f"   📋 Found task: {task_dict.get('title', 'No title')} in project: {project_name}"
-                    )
+        ordered_tasks = [
+            (proj_id, task_dict, task_ref)
+            for proj_id, tasks in assigned_tasks.items()
+            for task_dict, task_ref in tasks
+        ]
+
+        async def _get_project_names() -> dict[str, str]:
+            # タスクのあるプロジェクトの名前を get_all でまとめて取得（プロジェクト名のみ転送）
+            project_names = {}
+            project_refs = [
+                db.collection("projects").document(proj_id)
+                for proj_id, tasks in assigned_tasks.items()
+                if tasks
+            ]
+            if project_refs:
+                async for project_doc in db.get_all(
+                    project_refs, field_paths=["projectName"], retry=_READ_RETRY
+                ):
+                    if project_doc.exists:
+                        project_names[project_doc.id] = project_doc.to_dict().get(
+                            "projectName", project_doc.id
+                        )
+            return project_names
 
-                    # サブタスクを再帰的に取得
-                    subtasks = _get_subtasks_recursively(task_doc.reference, db)
-                    for subtask in subtasks:
-                        subtask["projectId"] = proj_id
-                        subtask["projectName"] = project_name
-                        all_tasks.append(subtask)
+        # プロジェクト名とサブタスク（タスクごと）は互いに独立しているので並行して取得
+        project_names, *subtask_lists = await asyncio.gather(
+            _get_project_names(),
+            *(_get_subtasks_recursively(task_ref, db) for _, _, task_ref in ordered_tasks),
+        )
 
-            except Exception as e:
-                print(f"⚠️  Error retrieving tasks from project {proj_id}: {e}")
-                continue
+        for (proj_id, task_dict, task_ref), subtasks in zip(ordered_tasks, subtask_lists):
+            project_name = project_names.get(proj_id, "Unknown Project")
+            # メタデータを追加
+            task_dict.update(
+                {
+                    "taskId": task_ref.id,
+                    "projectId": proj_id,
+                    "projectName": project_name,
+                    "taskPath": task_ref.path,
+                    "isSubTask": False,
+                    "nestingLevel": 0,
+                }
+            )
+            logger.debug(
+                "Found task: %s in project: %s",
+                task_dict.get("title", "No title"),
+                project_name,
+            )
+            all_tasks.append(task_dict)
+            for subtask in subtasks:
+                subtask["projectId"] = proj_id
+                subtask["projectName"] = project_name
+                all_tasks.append(subtask)
 
-        print(f"📊 Retrieved {len(all_tasks)} tasks total")
+        logger.info("Retrieved %d tasks total", len(all_tasks))
         return all_tasks
 
     except Exception as e:
-        print(f"❌ Error retrieving user tasks: {e}")
+        logger.error("Error retrieving user tasks: %s", e)
         return []
 
 
-def firestore_get_user_tasks(
+async def firestore_get_user_tasks(
     email_of_the_conversation_partner: str,
     project_id: Optional[str] = None,
     include_completed: bool = True,
@@ -617,16 +1208,16 @@ def firestore_get_user_tasks(
     Returns:
         str: 文字列形式のタスクリスト、見つからない場合は "No tasks found"
     """
-    result = _get_user_tasks(
+    result = await _get_user_tasks(
         email_of_the_conversation_partner, project_id, include_completed
     )
 
     if not result:
         return "No tasks found"
-    return str(result)
+    return _dumps_result(result)
 
 
-def _get_specific_task(
+async def _get_specific_task(
     project_id: str,
     task_id: str,
 ) -> dict[str, Any]:
@@ -641,13 +1232,13 @@ def _get_specific_task(
         dict[str, Any]: 特定のタスクを含む辞書、見つからない場合は空の辞書
     """
     try:
-        db = _db_client
+        db = _get_db()
 
         # Get specific task document
         task_path = f"projects/{project_id}/tasks/{task_id}"
 
         task_doc = db.document(task_path)
-        task_data = task_doc.get()
+        task_data = await task_doc.get(retry=_READ_RETRY)
 
         if task_data.exists:
             task_dict = task_data.to_dict()
@@ -657,18 +1248,18 @@ def _get_specific_task(
             task_dict["isSubTask"] = False  # This is a parent task
             task_dict["nestingLevel"] = 0
 
-            task_dict["subTasks"] = _get_subtasks_recursively(task_doc, db)
+            task_dict["subTasks"] = await _get_subtasks_recursively(task_doc, db)
             return task_dict
         else:
-            print(f"❌ Task not found at path: {task_path}")
+            logger.warning("❌ Task not found at path: %s", task_path)
             return {}
 
     except Exception as e:
-        print(f"❌ Error retrieving specific task: {str(e)}")
+        logger.error("❌ Error retrieving specific task: %s", e)
         return {"error": f"Failed to retrieve task: {str(e)}"}
 
 
-def firestore_get_specific_task(project_id: str, task_id: str) -> str:
+async def firestore_get_specific_task(project_id: str, task_id: str) -> str:
     """
     Firestoreから特定のタスクを取得する
 
@@ -679,18 +1270,61 @@ def firestore_get_specific_task(project_id: str, task_id: str) -> str:
     Returns:
         str: 文字列形式のタスク情報、見つからない場合は "Task not found"
     """
-    result = _get_specific_task(project_id, task_id)
+    result = await _get_specific_task(project_id, task_id)
     if not result or result == {}:
         return "Task not found"
-    return str(result)
+    return _dumps_result(result)
+
+
+def _to_task_context_dict(task_context_doc, project_id: str) -> dict[str, Any]:
+    """
+    taskContexts のドキュメントを返却用の辞書に変換する
+    """
+    task_context_dict = task_context_doc.to_dict()
+    task_context_dict["taskContextId"] = task_context_doc.id
+    task_context_dict["projectId"] = project_id
+
+    # Convert relatedTasks DocumentReference to path string if it exists
+    if isinstance(task_context_dict.get("relatedTasks"), BaseDocumentReference):
+        task_context_dict["relatedTasks"] = task_context_dict["relatedTasks"].path
+    return task_context_dict
+
+
+async def _get_task_contexts_by_project(db, user_ref) -> list[dict[str, Any]]:
+    """
+    taskEntities のプロジェクトごとに taskContexts を取得する（1プロジェクトにつき1回のクエリ）
+
+    Args:
+        db: Firestoreクライアント
+        user_ref: users/{email} の DocumentReference
+    """
+    # ドキュメントIDとサブコレクションしか使わないので、フィールドは転送させない
+    task_entities_ref = user_ref.collection("taskEntities").select([])
+
+    all_task_contexts = []
+    async for project_doc in task_entities_ref.stream(retry=_READ_RETRY):
+        if not project_doc.exists:
+            continue
+
+        # Get all taskContexts for this project
+        task_contexts_ref = project_doc.reference.collection("taskContexts")
+        async for task_context_doc in task_contexts_ref.stream(retry=_READ_RETRY):
+            if task_context_doc.exists:
+                all_task_contexts.append(
+                    _to_task_context_dict(task_context_doc, project_doc.id)
+                )
+    return all_task_contexts
 
 
-def _get_user_task_contexts(
+async def _get_user_task_contexts(
     email_of_the_conversation_partner: str,
 ) -> list[dict[str, Any]]:
     """
     ユーザーの全taskContextsをFirestoreから取得する
 
+    users/{email} 配下の taskContexts を collection_group クエリ1回でまとめて取得する。
+    クエリに失敗した場合はプロジェクトごとに取得する方式にフォールバックする。
+
     Args:
         email_of_the_conversation_partner (str): ユーザーのメールアドレス
 
@@ -698,52 +1332,50 @@ def _get_user_task_contexts(
         list[dict[str, Any]]: 全プロジェクトのタスクコンテキストのリスト
     """
     try:
-        db = _db_client
-
-        # Get all taskEntities for the user
-        task_entities_ref = (
-            db.collection("users")
-            .document(email_of_the_conversation_partner)
-            .collection("taskEntities")
-        )
-
-        all_task_contexts = []
+        db = _get_db()
+        user_ref = db.collection("users").document(email_of_the_conversation_partner)
 
-        for project_doc in task_entities_ref.stream():
-            if not project_doc.exists:
-                continue
-
-            project_id = project_doc.id
-            task_contexts_ref = project_doc.reference.collection("taskContexts")
-
-            # Get all taskContexts for this project
-            for task_context_doc in task_contexts_ref.stream():
-                if not task_context_doc.exists:
-                    continue
-
-                task_context_dict = task_context_doc.to_dict()
-                task_context_dict["taskContextId"] = task_context_doc.id
-                task_context_dict["projectId"] = project_id
+        try:
+            # users/{email} 配下の全 taskContexts をドキュメント名の範囲で絞り込む
+            # （名前順なので、プロジェクトID順・プロジェクト内はID順でこれまでと同じ並びになる）
+            task_contexts_query = (
+                db.collection_group("taskContexts")
+                .where(filter=FieldFilter("__name__", ">", user_ref))
+                .where(
+                    filter=FieldFilter(
+                        "__name__", "<", db.document(user_ref.path + "\uf8ff")
+                    )
+                )
+            )
 
-                # Convert relatedTasks DocumentReference to path string if it exists
-                if "relatedTasks" in task_context_dict and hasattr(
-                    task_context_dict["relatedTasks"], "path"
+            all_task_contexts = []
+            async for task_context_doc in task_contexts_query.stream(retry=_READ_RETRY):
+                # users/{email}/taskEntities/{projectId}/taskContexts/{id} のみ対象
+                # （同じ接頭辞を持つ別ユーザーや、別の階層の taskContexts は除外）
+                path = task_context_doc.reference.path.split("/")
+                if (
+                    not task_context_doc.exists
+                    or len(path) != 6
+                    or path[:3] != ["users", email_of_the_conversation_partner, "taskEntities"]
                 ):
-                    task_context_dict["relatedTasks"] = task_context_dict[
-                        "relatedTasks"
-                    ].path
+                    continue
+                all_task_contexts.append(_to_task_context_dict(task_context_doc, path[3]))
 
-                all_task_contexts.append(task_context_dict)
+        except Exception as e:
+            logger.warning(
+                "taskContexts collection group query failed, falling back to per-project reads: %s", e
+            )
+            all_task_contexts = await _get_task_contexts_by_project(db, user_ref)
 
-        print(f"📊 Retrieved {len(all_task_contexts)} task contexts")
+        logger.info("📊 Retrieved %d task contexts", len(all_task_contexts))
         return all_task_contexts
 
     except Exception as e:
-        print(f"❌ Error retrieving task contexts: {e}")
+        logger.error("❌ Error retrieving task contexts: %s", e)
         return []
 
 
-def firestore_get_user_task_contexts(email_of_the_conversation_partner: str) -> str:
+async def firestore_get_user_task_contexts(email_of_the_conversation_partner: str) -> str:
     """
     ユーザーの全taskContextsをFirestoreから取得する
 
@@ -756,14 +1388,14 @@ def firestore_get_user_task_contexts(email_of_the_conversation_partner: str) ->
     Returns:
         str: 文字列形式のタスクコンテキストリスト、見つからない場合は "No task contexts found"
     """
-    result = _get_user_task_contexts(email_of_the_conversation_partner)
+    result = await _get_user_task_contexts(email_of_the_conversation_partner)
 
     if not result:
         return "No task contexts found"
-    return str(result)
+    return _dumps_result(result)
 
 
-def _get_specific_subtask(
+async def _get_specific_subtask(
     project_id: str,
     parent_task_id: str,
     sub_task_id: str,
@@ -780,7 +1412,7 @@ def _get_specific_subtask(
         dict[str, Any]: サブタスクを含む辞書、見つからない場合は空の辞書
     """
     try:
-        db = _db_client
+        db = _get_db()
 
         # Get subtask document path: projects/{project_id}/tasks/{parent_task_id}/subTasks/{sub_task_id}
         subtask_path = (
@@ -788,7 +1420,7 @@ def _get_specific_subtask(
         )
 
         subtask_doc = db.document(subtask_path)
-        subtask_data = subtask_doc.get()
+        subtask_data = await subtask_doc.get(retry=_READ_RETRY)
 
         if subtask_data.exists:
             subtask_dict = subtask_data.to_dict()
@@ -800,22 +1432,22 @@ def _get_specific_subtask(
             subtask_dict["nestingLevel"] = 1
 
             # サブタスクの下にさらにサブタスクがある場合は再帰的に取得
-            subtask_dict["subTasks"] = _get_subtasks_recursively(
+            subtask_dict["subTasks"] = await _get_subtasks_recursively(
                 subtask_doc, db, level=2
             )
 
-            print(f"📋 Retrieved subtask: {subtask_dict.get('title', 'No title')}")
+            logger.debug("📋 Retrieved subtask: %s", subtask_dict.get("title", "No title"))
             return subtask_dict
         else:
-            print(f"❌ Subtask not found at path: {subtask_path}")
+            logger.warning("❌ Subtask not found at path: %s", subtask_path)
             return {}
 
     except Exception as e:
-        print(f"❌ Error retrieving specific subtask: {str(e)}")
+        logger.error("❌ Error retrieving specific subtask: %s", e)
         return {"error": f"Failed to retrieve subtask: {str(e)}"}
 
 
-def firestore_get_specific_subtask(
+async def firestore_get_specific_subtask(
     project_id: str,
     parent_task_id: str,
     sub_task_id: str,
@@ -831,13 +1463,71 @@ def firestore_get_specific_subtask(
     Returns:
         str: 文字列形式のサブタスク情報、見つからない場合は "Subtask not found"
     """
-    result = _get_specific_subtask(project_id, parent_task_id, sub_task_id)
+    result = await _get_specific_subtask(project_id, parent_task_id, sub_task_id)
     if not result or result == {}:
         return "Subtask not found"
-    return str(result)
+    return _dumps_result(result)
+
 
+def _email_from_ref(user_ref: BaseDocumentReference) -> Optional[str]:
+    """
+    users/{email} または users/{email}/... の DocumentReference からメールアドレスを取り出す
+    """
+    # メールアドレスに "/" は含まれないので、パスをセグメントに分けて2番目を取り出す
+    path = user_ref.path.split("/")
+    if len(path) >= 2 and path[0] == "users":
+        return path[1]
+    return None
+
+
+def _member_ref(member: Any) -> Optional[BaseDocumentReference]:
+    """
+    members の要素から userRef を取り出す（userRef を持つ辞書と DocumentReference そのものの両方に対応）
+    """
+    user_ref = member.get("userRef") if isinstance(member, dict) else member
+    if isinstance(user_ref, BaseDocumentReference):
+        return user_ref
+    return None
 
-def _get_user_projects(
+
+def _is_project_document(doc) -> bool:
+    """
+    projects/{projectId} 直下のドキュメントかどうか（to_dict() する前に参照の親だけで判定する）
+    """
+    collection = doc.reference.parent
+    return collection.id == "projects" and collection.parent is None
+
+
+def _member_emails(members: list) -> list[str]:
+    """
+    members の userRef（users/{email}/...）からメールアドレスの一覧を作る（_member_ref と同じ形式に対応）
+    """
+    emails = []
+    for member in members:
+        user_ref = _member_ref(member)
+        if user_ref is None:
+            continue
+        email = _email_from_ref(user_ref)
+        if email is not None and email not in emails:
+            emails.append(email)
+    return emails
+
+
+def _to_user_project_info(project_doc) -> dict[str, Any]:
+    """
+    プロジェクトドキュメントを _get_user_projects の返却形式に変換する
+    """
+    project_data = project_doc.to_dict()
+    return {
+        "projectId": project_doc.id,
+        "projectName": project_data.get("projectName", "Unnamed Project"),
+        "status": project_data.get("status", "unknown"),
+        "description": project_data.get("description", ""),
+    }
+
+
+@_ttl_cache
+async def _get_user_projects(
     email_of_the_conversation_partner: str,
 ) -> list[dict[str, Any]]:
     """
@@ -850,55 +1540,67 @@ def _get_user_projects(
         list[dict[str, Any]]: ユーザーが参画している全プロジェクトのリスト
     """
     try:
-        db = _db_client
+        db = _get_db()
 
         # Get all projects (no status filter)
         projects_ref = db.collection("projects")
 
         user_projects = []
 
-        for project_doc in projects_ref.stream():
-            if not project_doc.exists:
-                continue
-
-            project_data = project_doc.to_dict()
-            members = project_data.get("members", [])
-
-            # Check if user is in members
-            for member in members:
-                # member can be a dict with userRef or a DocumentReference directly
-                user_ref = None
-                if isinstance(member, dict) and "userRef" in member:
-                    user_ref = member["userRef"]
-                elif hasattr(member, "path"):
-                    user_ref = member
-
-                # Check if userRef path contains the user's email
-                if user_ref and hasattr(user_ref, "path"):
-                    if email_of_the_conversation_partner in user_ref.path:
-                        # Add project info
-                        project_info = {
-                            "projectId": project_doc.id,
-                            "projectName": project_data.get(
-                                "projectName", "Unnamed Project"
-                            ),
-                            "status": project_data.get("status", "unknown"),
-                            "description": project_data.get("description", ""),
-                        }
-                        user_projects.append(project_info)
-                        break  # Found the user, no need to check other members
-
-        print(
-            f"📊 Retrieved {len(user_projects)} projects for user {email_of_the_conversation_partner}"
+        # memberEmails（メンバーのメールアドレスを非正規化した配列）でサーバー側に絞り込ませる
+        # （既存プロジェクトには deployments/backfill_member_emails.py で事前に付与しておく）
+        member_query = projects_ref.where(
+            filter=FieldFilter(
+                "memberEmails", "array_contains", email_of_the_conversation_partner
+            )
+        ).select(["projectName", "status", "description"])
+        async for project_doc in member_query.stream(retry=_READ_RETRY):
+            user_projects.append(_to_user_project_info(project_doc))
+
+        logger.info(
+            "Retrieved %d projects for user %s",
+            len(user_projects),
+            email_of_the_conversation_partner,
         )
         return user_projects
 
     except Exception as e:
-        print(f"❌ Error retrieving user projects: {e}")
+        logger.error("Error retrieving user projects: %s", e)
         return []
 
 
-def _get_user_info(
+async def backfill_member_emails() -> int:
+    """
+    全プロジェクトの members から memberEmails を作り直して保存する（運用時に一度だけ実行する想定）
+
+    memberEmails は _get_user_projects の array_contains 検索に使う非正規化フィールドで、
+    プロジェクトの作成・更新時に members と一緒に書き込む。
+    memberEmails を持たないプロジェクトは検索に出てこないので、
+    この変更のデプロイ前に deployments/backfill_member_emails.py から一度実行する。
+
+    Returns:
+        int: memberEmails を書き込んだプロジェクト数
+    """
+    db = _get_db()
+    writes = []
+    async for project_doc in _iter_documents(
+        db.collection("projects").select(["members", "memberEmails"])
+    ):
+        if not project_doc.exists or not _is_project_document(project_doc):
+            continue
+        project_data = project_doc.to_dict()
+        member_emails = _member_emails(project_data.get("members", []))
+        if project_data.get("memberEmails") != member_emails:
+            writes.append((project_doc.reference, {"memberEmails": member_emails}))
+
+    await _commit_in_batches(db, writes, merge=True)
+    invalidate_cache()
+    logger.info("Backfilled memberEmails for %d projects", len(writes))
+    return len(writes)
+
+
+@_ttl_cache
+async def _get_user_info(
     user_email: str,
 ) -> dict[str, Any]:
     """
@@ -911,11 +1613,11 @@ def _get_user_info(
         dict[str, Any]: ユーザー情報を含む辞書、見つからない場合は空の辞書
     """
     try:
-        db = _db_client
+        db = _get_db()
 
         # users/{email}/userProfiles から最新のプロファイルを取得
         # コレクションクエリとしてselectを使用
-        docs = (
+        doc = await _get_first_document(
             db.collection("users")
             .document(user_email)
             .collection("userProfiles")
@@ -924,25 +1626,72 @@ def _get_user_info(
                     "displayName",
                     "nickname",
                 ]
-            )
-            .limit(1)
-            .stream()
+            ),
+            read_time=_stale_read_time(),
         )
+        if doc is not None and doc.exists:
+            user_info = doc.to_dict()
+            return user_info
 
-        for doc in docs:
-            if doc.exists:
-                user_info = doc.to_dict()
-                return user_info
-
-        print(f"❌ User not found")
+        logger.warning("❌ User not found: %s", user_email)
         return {}
 
     except Exception as e:
-        print(f"❌ Error retrieving user info: {str(e)}")
+        logger.error("❌ Error retrieving user info: %s", e)
         return {"error": f"Failed to retrieve user info: {str(e)}"}
 
 
-def firestore_get_user_projects(email_of_the_conversation_partner: str) -> str:
+def _member_user_email(member: dict[str, Any]) -> Optional[str]:
+    """
+    members の要素の userRef からメールアドレスを取得する（取得できない場合はNone）
+    """
+    # 対応形式: users/{email} または users/{email}/userProfiles/{id}
+    user_ref = member.get("userRef")
+    if isinstance(user_ref, BaseDocumentReference):
+        return _email_from_ref(user_ref)
+    return None
+
+
+async def _attach_member_user_infos(
+    members_lists: list[list[dict[str, Any]]],
+    user_info_tasks: Optional[dict[str, asyncio.Future]] = None,
+) -> None:
+    """
+    members の userRef からユーザー情報を取得して userInfo に設定する（isOwner / userRef は削除）
+
+    複数プロジェクトに同じユーザーがいても取得は1回だけにし、異なるユーザーは並行して取得する。
+
+    Args:
+        members_lists (list[list[dict[str, Any]]]): プロジェクトごとの members のリスト
+        user_info_tasks (Optional[dict[str, asyncio.Future]]): 取得を開始済みのユーザー情報（email -> Future）
+    """
+    if user_info_tasks is None:
+        user_info_tasks = {}
+
+    member_emails = []
+    for members in members_lists:
+        for member in members:
+            user_email = _member_user_email(member)
+            if user_email is not None and user_email not in user_info_tasks:
+                user_info_tasks[user_email] = asyncio.ensure_future(
+                    _get_user_info(user_email)
+                )
+            member_emails.append((member, user_email))
+
+    emails = list(user_info_tasks)
+    user_infos = dict(
+        zip(emails, await asyncio.gather(*(user_info_tasks[email] for email in emails)))
+    )
+
+    for member, user_email in member_emails:
+        if user_email is not None:
+            member["userInfo"] = dict(user_infos[user_email])
+        # isOwnerは常に削除
+        member.pop("isOwner", None)
+        member.pop("userRef", None)
+
+
+async def firestore_get_user_projects(email_of_the_conversation_partner: str) -> str:
     """
     ユーザーが参画している全てのプロジェクトを取得する（ステータス問わず）
 
@@ -955,14 +1704,149 @@ def firestore_get_user_projects(email_of_the_conversation_partner: str) -> str:
     Returns:
         str: 文字列形式のプロジェクトリスト、見つからない場合は "No projects found"
     """
-    result = _get_user_projects(email_of_the_conversation_partner)
+    result = await _get_user_projects(email_of_the_conversation_partner)
 
     if not result:
         return "No projects found"
-    return str(result)
+    return _dumps_result(result)
+
 
+# 全プロジェクト一覧で返せるフィールド（projectId は常に返す）と、値がない場合の既定値
+_PROJECT_LIST_FIELDS = ("projectName", "status", "projectOverview", "members")
+_PROJECT_LIST_DEFAULTS = {"projectName": "Unnamed Project", "status": "unknown", "projectOverview": ""}
 
-def firestore_get_all_projects() -> str:
+
+async def _iter_all_projects(
+    projects_ref,
+    user_info_tasks: dict[str, Any],
+    fields: tuple[str, ...] = _PROJECT_LIST_FIELDS,
+):
+    """
+    projects を1件ずつ整形して返す（呼び出し側が必要な件数だけ読めるよう、リストにはまとめない）
+
+    Args:
+        projects_ref: projects に対するクエリ
+        user_info_tasks (dict[str, Any]): メールアドレス -> _get_user_info のタスク。
+            新しく出てきたメンバーの分をここに追加していく
+        fields (tuple[str, ...]): 返すフィールド（_PROJECT_LIST_FIELDS の部分集合）
+    """
+    async with contextlib.aclosing(_iter_documents(projects_ref)) as project_docs:
+        async for project_doc in project_docs:
+            # サブコレクションのドキュメントが混ざっても、デシリアライズせずに読み飛ばす
+            if not project_doc.exists or not _is_project_document(project_doc):
+                continue
+
+            project_data = project_doc.to_dict()
+            project_get = project_data.get
+
+            project_info = {"projectId": project_doc.id}
+            for field in fields:
+                if field != "members":
+                    project_info[field] = project_get(field, _PROJECT_LIST_DEFAULTS[field])
+                    continue
+
+                members = project_get("members", [])
+                # 残りのプロジェクトを受信している間に、新しく出てきたメンバーのユーザー情報の取得を始める
+                for member in members:
+                    user_email = _member_user_email(member)
+                    if user_email is not None and user_email not in user_info_tasks:
+                        user_info_tasks[user_email] = asyncio.ensure_future(
+                            _get_user_info(user_email)
+                        )
+                project_info["members"] = members
+
+            yield project_info
+
+
+def _has_member_user_info_error(members: Any) -> bool:
+    """
+    members のいずれかで、ユーザー情報の取得に失敗した（userInfo に error がある）かどうか
+    """
+    return any(
+        isinstance(member, dict)
+        and isinstance(member.get("userInfo"), dict)
+        and "error" in member["userInfo"]
+        for member in members
+    )
+
+
+def _project_infos_cacheable(projects: list[dict[str, Any]]) -> bool:
+    # ユーザー情報の一時的な取得失敗を含む一覧は、TTLの間使い回さない
+    return not any(
+        _has_member_user_info_error(project.get("members", ())) for project in projects
+    )
+
+
+@_ttl_cache(cacheable=_project_infos_cacheable)
+async def _get_all_project_infos(
+    fields: tuple[str, ...],
+    max_results: Optional[int] = None,
+    status: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """
+    projects を一覧用に整形し、メンバーのユーザー情報を付けて返す
+
+    スケジューラーは全プロジェクトの一覧を頻繁に読むが、中身の変化はずっと遅いので、
+    走査結果をTTLの間は使い回す（プロジェクトを書き込むと invalidate_cache で破棄される）。
+
+    Args:
+        fields (tuple[str, ...]): 返すフィールド（_PROJECT_LIST_FIELDS の部分集合）
+        max_results (Optional[int]): 取得する最大件数（Noneの場合は全件、0以下の場合は空）
+        status (Optional[str]): 指定した場合はこの status のプロジェクトだけを読む
+    """
+    # 0件以下が指定された場合は走査せずに空を返す
+    if max_results is not None and max_results <= 0:
+        return []
+
+    db = _get_db()
+    projects_ref = db.collection("projects")
+    if status is not None:
+        projects_ref = projects_ref.where(filter=FieldFilter("status", "==", status))
+    # 要求されたフィールドだけを転送する
+    projects_ref = projects_ref.select(list(fields))
+
+    all_projects = []
+    user_info_tasks = {}
+
+    # 上限に達したらそれ以降のページは読まない（抜けた時点でストリームも閉じる）
+    async with contextlib.aclosing(
+        _iter_all_projects(projects_ref, user_info_tasks, fields)
+    ) as projects:
+        async for project_info in projects:
+            all_projects.append(project_info)
+            if max_results is not None and len(all_projects) >= max_results:
+                break
+
+    # 各メンバーにユーザー情報を追加（全プロジェクト分をまとめて取得）
+    if "members" in fields:
+        await _attach_member_user_infos(
+            [project_info["members"] for project_info in all_projects], user_info_tasks
+        )
+    return all_projects
+
+
+@_ttl_cache
+async def _get_all_cleaned_projects() -> list[dict[str, Any]]:
+    """
+    projects の全ドキュメントをクリーニングして返す（辞書形式の一覧ツール用）
+
+    _get_all_project_infos と同じく、走査結果をTTLの間は使い回す。
+    """
+    db = _get_db()
+    projects = []
+    async with contextlib.aclosing(_iter_documents(db.collection("projects"))) as docs:
+        async for doc in docs:
+            if not _is_project_document(doc):
+                continue
+            # FirestoreオブジェクトをJSON化可能な形式に変換
+            projects.append(_clean_firestore_data(doc.to_dict()))
+    return projects
+
+
+async def firestore_get_all_projects(
+    max_results: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+) -> str:
     """
     全てのプロジェクトを取得する（status="open"のみ）
 
@@ -970,96 +1854,119 @@ def firestore_get_all_projects() -> str:
     全プロジェクトのリストを取得するために使用します。
     活動中のユーザーを収集するため、statusが"open"のプロジェクトのみを返します。
 
+    Args:
+        max_results (Optional[int]): 取得する最大件数（省略時は全件）
+        fields (Optional[List[str]]): 返すフィールド（projectName / status / projectOverview / members。
+            projectId は常に返す。省略時は全て）。members を含めない場合はメンバーのユーザー情報を取得しない
+
     Returns:
         str: 文字列形式のプロジェクトリスト、見つからない場合は "No projects found"
     """
     logger.info("### firestore_get_all_projects start ###")
     try:
-        db = _db_client
-
-        # Get all projects
-        projects_ref = (
-            db.collection("projects")
-            .select(["projectName", "status", "members", "projectOverview"])
-        )
-
-        all_projects = []
-
-        for project_doc in projects_ref.stream():
-            if not project_doc.exists:
-                continue
-
-            project_data = project_doc.to_dict()
+        if fields is None:
+            selected_fields = _PROJECT_LIST_FIELDS
+        else:
+            selected_fields = tuple(f for f in _PROJECT_LIST_FIELDS if f in fields)
 
-            # 各メンバーにユーザー情報を追加
-            if "members" in project_data:
-                for member in project_data["members"]:
-                    # userRefが有効な場合のみユーザー情報を追加
-                    if "userRef" in member and hasattr(member["userRef"], "path"):
-                        # userRefのパスからemailを取得
-                        # 対応形式: users/{email} または users/{email}/userProfiles/{id}
-                        path_parts = member["userRef"].path.split("/")
-                        if len(path_parts) >= 2 and path_parts[0] == "users":
-                            user_email = path_parts[1]
-                            member["userInfo"] = _get_user_info(user_email)
-                    # isOwnerは常に削除
-                    member.pop("isOwner", None)
-                    member.pop("userRef", None)
-
-            # Add project info
-            project_info = {
-                "projectId": project_doc.id,
-                "projectName": project_data.get("projectName", "Unnamed Project"),
-                "status": project_data.get("status", "unknown"),
-                "projectOverview": project_data.get("projectOverview", ""),
-                "members": project_data.get("members", []),
-            }
-            all_projects.append(project_info)
+        all_projects = await _get_all_project_infos(selected_fields, max_results)
 
-        logger.info(f"📊 Retrieved {len(all_projects)} open projects")
+        logger.info("📊 Retrieved %s open projects", len(all_projects))
 
         if not all_projects:
             return "No projects found"
-        return str(all_projects)
+        return _dumps_result(all_projects)
 
     except Exception as e:
-        print(f"❌ Error retrieving all projects: {e}")
+        logger.error("❌ Error retrieving all projects: %s", e)
         return "No projects found"
 
 
-def firestore_get_project_by_id(project_id: str) -> str:
+def _project_cacheable(project: dict[str, Any]) -> bool:
+    # ユーザー情報の一時的な取得失敗を含む結果は、TTLの間使い回さない
+    return not _has_member_user_info_error(project.get("members", ()))
+
+
+@_ttl_cache(cacheable=_project_cacheable)
+async def _get_project_by_id(project_id: str) -> dict[str, Any]:
+    """
+    プロジェクトをIDで取得し、メンバーのユーザー情報を付与する（見つからない場合は空の辞書）
+
+    キャッシュでコピーできるよう、DocumentReference 等は文字列化した状態で返す。
+    """
+    db = _get_db()
+    doc = (
+        await db.collection("projects")
+        .document(project_id)
+        .get(retry=_READ_RETRY)
+    )
+
+    if not doc.exists:
+        return {}
+
+    project_data = doc.to_dict()
+    project_data["projectId"] = doc.id
+
+    # メンバー情報のクリーンアップ/拡張
+    if "members" in project_data:
+        await _attach_member_user_infos([project_data["members"]])
+
+    return _clean_firestore_data(project_data)
+
+
+async def firestore_get_project_by_id(project_id: str) -> str:
     """
     特定のプロジェクトをIDで取得する
     """
-    logger.info(f"### firestore_get_project_by_id start: {project_id} ###")
+    logger.info("### firestore_get_project_by_id start: %s ###", project_id)
     try:
-        db = _db_client
-        doc = db.collection("projects").document(project_id).get()
+        project_data = await _get_project_by_id(project_id)
         
-        if not doc.exists:
+        if not project_data:
             return f"Project with ID {project_id} not found"
-            
-        project_data = doc.to_dict()
-        project_data["projectId"] = doc.id
-        
-        # メンバー情報のクリーンアップ/拡張
-        if "members" in project_data:
-            for member in project_data["members"]:
-                if "userRef" in member and hasattr(member["userRef"], "path"):
-                    path_parts = member["userRef"].path.split("/")
-                    if len(path_parts) >= 2 and path_parts[0] == "users":
-                        user_email = path_parts[1]
-                        member["userInfo"] = _get_user_info(user_email)
-                member.pop("isOwner", None)
-                member.pop("userRef", None)
                 
-        return str(project_data)
+        return _dumps_result(project_data)
     except Exception as e:
-        logger.error(f"Error retrieving project {project_id}: {e}")
+        logger.error("Error retrieving project %s: %s", project_id, e)
         return f"Error retrieving project: {str(e)}"
 
 
-def firestore_create_project(
+# ルールの priority（日本語表記）を保存用の値に変換する
+_RULE_PRIORITY_MAP: Dict[str, str] = {"必須": "mandatory", "高": "high", "中": "normal", "低": "low"}
+
+
+def _member_from_dict(member: dict, user_email: str) -> tuple[dict, Any]:
+    """
+    辞書形式で渡されたメンバーを保存用の辞書（userRef 以外）とメールアドレスに変換する
+    """
+    email = member.get("userRef") or member.get("email") or ""
+    if isinstance(email, BaseDocumentReference): email = email.id # DocumentReference対策
+    m = {
+        "isOwner": bool(member.get("isOwner", False)),
+        "role": str(member.get("role", "Engineer")),
+        "roleDetails": str(member.get("roleDetails", "")),
+    }
+    return m, email
+
+
+def _member_from_str(member: str, user_email: str) -> tuple[dict, Any]:
+    """
+    メールアドレスだけで渡されたメンバーを保存用の辞書（userRef 以外）とメールアドレスに変換する
+    """
+    is_owner = (member == user_email)
+    m = {
+        "isOwner": is_owner,
+        "role": "Owner" if is_owner else "Engineer",
+        "roleDetails": "",
+    }
+    return m, member
+
+
+# メンバー入力の型 -> 変換関数
+_MEMBER_HANDLERS = {dict: _member_from_dict, str: _member_from_str}
+
+
+async def firestore_create_project(
     user_email: str,
     project_name: Optional[str] = None,
     project_overview: Optional[str] = None,
@@ -1071,7 +1978,7 @@ def firestore_create_project(
     Firestore直接操作でプロジェクトを新規作成する (ADK Agent用レスポンス形式)
     ADK Function Calling互換性を重視したシンプル版
     """
-    logger.info(f"Creating project via Firestore: {project_name}")
+    logger.info("Creating project via Firestore: %s", project_name)
     
     # デフォルト値の処理
     if members is None:
@@ -1081,17 +1988,8 @@ def firestore_create_project(
     if not project_name:
         return {"firestore_create_project_response": {"error": "プロジェクト名が必要です"}}
     
-    # 空のオブジェクトをフィルタリング（ADKのFunction Calling制限への対応）
-    if members:
-        # 文字列のリスト（メールアドレス）または辞書のリストを許容
-        members = [m for m in members if m]
-        logger.debug(f"Filtered members: {members}")
-    
     try:
-        db = _db_client
-        
-        # JST timezone用のタイムスタンプ
-        current_time = convert_utc_to_jst(datetime.now(dt_timezone.utc))
+        db = _get_db()
         
         # データベースへの保存用データ構築
         project_data = {
@@ -1099,8 +1997,9 @@ def firestore_create_project(
             "projectOverview": project_overview or "",
             "status": status or "open",
             "projectOwner": [user_email],
-            "createdAt": current_time,
-            "updatedAt": current_time,
+            # 作成・更新日時はサーバー側のタイムスタンプで記録する
+            "createdAt": firestore.SERVER_TIMESTAMP,
+            "updatedAt": firestore.SERVER_TIMESTAMP,
             "createdBy": user_email
         }
         
@@ -1113,8 +2012,7 @@ def firestore_create_project(
                 content = r.get("content") or r.get("rule") or ""
                 # priority の値を標準化
                 priority = r.get("priority", "normal")
-                priority_map = {"必須": "mandatory", "高": "high", "中": "normal", "低": "low"}
-                priority = priority_map.get(priority, priority)
+                priority = _RULE_PRIORITY_MAP.get(priority, priority)
                 
                 processed_rules.append({
                     "content": content,
@@ -1124,27 +2022,23 @@ def firestore_create_project(
         
         # membersの処理: 全ての必須フィールド (isOwner, role, roleDetails, userRef) を保証
         processed_members = []
+        users_col = db.collection("users")  # メンバーごとに CollectionReference を作らない
         if members:
             for member in members:
+                # 空のオブジェクトは読み飛ばす（ADKのFunction Calling制限への対応）
                 if not member: continue
-                m = {}
-                email = ""
-                if isinstance(member, dict):
-                    email = member.get("userRef") or member.get("email") or ""
-                    if hasattr(email, "path"): email = email.id # DocumentReference対策
-                    m["isOwner"] = bool(member.get("isOwner", False))
-                    m["role"] = str(member.get("role", "Engineer"))
-                    m["roleDetails"] = str(member.get("roleDetails", ""))
-                elif isinstance(member, str):
-                    email = member
-                    m["isOwner"] = (email == user_email)
-                    m["role"] = "Owner" if m["isOwner"] else "Engineer"
-                    m["roleDetails"] = ""
+                # 入力の型（辞書 / メールアドレス文字列）ごとの変換関数を1回の辞書引きで選ぶ
+                handler = _MEMBER_HANDLERS.get(type(member))
+                if handler is None:
+                    continue
+                m, email = handler(member, user_email)
                 
                 if "@" in str(email):
-                    m["userRef"] = db.collection("users").document(str(email))
+                    m["userRef"] = users_col.document(str(email))
                     processed_members.append(m)
+        logger.debug("Processed members: %s", processed_members)
         project_data["members"] = processed_members
+        project_data["memberEmails"] = _member_emails(processed_members)
         
         # Firestoreに保存 (空のドキュメントリファレンスを作成して自動生成されたIDを取得)
         doc_ref = db.collection("projects").document()
@@ -1153,17 +2047,22 @@ def firestore_create_project(
         # ドキュメントにprojectIdを含める
         project_data["projectId"] = project_id
         
-        # 保存実行
-        doc_ref.set(project_data)
+        # 保存実行 (同時に作成する子ドキュメントが増えても1回のコミットで済むようバッチで書き込む)
+        await _commit_in_batches(db, [(doc_ref, project_data)])
+        invalidate_cache()
         
         # デバッグ情報をログ出力
-        logger.info(f"✅ Project created successfully:")
-        logger.info(f"   - Project ID: {project_id}")
-        logger.info(f"   - Project Name: {project_name}")
-        logger.info(f"   - Firestore Path: projects/{project_id}")
-        logger.info(f"   - DATABASE: {FIRESTORE_DATABASE}")
-        logger.info(f"   - PROJECT_ID: {PROJECT_ID}")
-        logger.info(f"   - Document Data: {project_data}")
+        logger.info(
+            "✅ Project created successfully: id=%s name=%s path=projects/%s "
+            "database=%s gcp_project=%s",
+            project_id,
+            project_name,
+            project_id,
+            FIRESTORE_DATABASE,
+            PROJECT_ID,
+        )
+        # ドキュメント全体の文字列化は重いので DEBUG に下げる（無効なら整形自体が行われない）
+        logger.debug("   - Document Data: %s", project_data)
         
         return {
             "firestore_create_project_response": {
@@ -1180,7 +2079,7 @@ def firestore_create_project(
         return {"firestore_create_project_response": {"error": error_msg}}
 
 
-def firestore_get_all_projects_dict() -> dict:
+async def firestore_get_all_projects_dict() -> dict:
     """
     Firestore直接操作で全プロジェクトを取得する (辞書形式)
     内部的なクリーニング処理が含まれます。
@@ -1188,14 +2087,7 @@ def firestore_get_all_projects_dict() -> dict:
     logger.info("Getting all projects via Firestore (dict format)")
     
     try:
-        db = _db_client
-        docs = db.collection("projects").stream()
-        
-        projects = []
-        for doc in docs:
-            project_data = doc.to_dict()
-            cleaned_data = _clean_firestore_data(project_data)
-            projects.append(cleaned_data)
+        projects = await _get_all_cleaned_projects()
         
         return {
             "firestore_get_all_projects_response": {
@@ -1207,7 +2099,7 @@ def firestore_get_all_projects_dict() -> dict:
         return {"firestore_get_all_projects_response": {"error": str(e), "projects": [], "count": 0}}
 
 
-def firestore_update_project(
+async def firestore_update_project(
     project_id: str,
     project_name: Optional[str] = None,
     status: Optional[str] = None,
@@ -1219,17 +2111,17 @@ def firestore_update_project(
     """
     Firestore直接操作でプロジェクトを更新する (ADK Agent用レスポンス形式)
     """
-    logger.info(f"Updating project via Firestore: {project_id}")
+    logger.info("Updating project via Firestore: %s", project_id)
     
     if not project_id:
         return {"firestore_update_project_response": {"error": "project_id is required"}}
     
     try:
-        db = _db_client
+        db = _get_db()
         
         # 更新データを構築
         update_data = {
-            "updatedAt": convert_utc_to_jst(datetime.now(dt_timezone.utc)),
+            "updatedAt": firestore.SERVER_TIMESTAMP,
             "updatedBy": user_email
         }
         
@@ -1242,6 +2134,7 @@ def firestore_update_project(
         if members is not None:
             # userRefをDocumentReferenceに変換
             processed_members = []
+            users_col = db.collection("users")  # メンバーごとに CollectionReference を作らない
             for member in members:
                 if not member or not any(member.values()):
                     continue
@@ -1252,20 +2145,21 @@ def firestore_update_project(
                 user_email_member = m.get("userRef") or m.get("email")
                 if isinstance(user_email_member, str) and "@" in user_email_member:
                     # users/{email}へのDocumentReferenceに変換
-                    m["userRef"] = db.collection("users").document(user_email_member)
+                    m["userRef"] = users_col.document(user_email_member)
                     # emailキーが存在する場合は削除してuserRefに統一
-                    if "email" in m:
-                        del m["email"]
+                    m.pop("email", None)
                 processed_members.append(m)
             update_data["members"] = processed_members
+            update_data["memberEmails"] = _member_emails(processed_members)
         if rules is not None:
             update_data["rules"] = rules
         
         # Firestoreドキュメントを更新
         project_ref = db.collection("projects").document(project_id)
-        project_ref.update(update_data)
+        await project_ref.update(update_data)
+        invalidate_cache()
         
-        logger.info(f"✅ Project updated successfully: {project_id}")
+        logger.info("✅ Project updated successfully: %s", project_id)
         
         return {
             "firestore_update_project_response": {
@@ -1282,7 +2176,21 @@ def firestore_update_project(
         return {"firestore_update_project_response": {"error": error_msg}}
 
 
-def firestore_create_task(
+def _parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
+    """
+    ISO 8601 形式の日付文字列を datetime に変換する（未指定・解釈できない場合はNone）
+
+    Python 3.11 以降の fromisoformat は末尾の "Z" もそのまま解釈できる。
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+async def firestore_create_task(
     user_email: str,
     project_id: str,
     title: str,
@@ -1296,14 +2204,13 @@ def firestore_create_task(
     """
     プロジェクト配下に新規タスクを作成する
     """
-    logger.info(f"Creating task for project {project_id}: {title}")
+    logger.info("Creating task for project %s: %s", project_id, title)
     
     if not project_id or not title:
         return {"firestore_create_task_response": {"error": "project_id and title are required"}}
     
     try:
-        db = _db_client
-        current_time = convert_utc_to_jst(datetime.now(dt_timezone.utc))
+        db = _get_db()
         
         # データの構築
         task_data = {
@@ -1314,24 +2221,21 @@ def firestore_create_task(
             "priority": priority,
             "inReview": False,
             "type": "task",
-            "createdAt": current_time,
-            "updatedAt": current_time,
+            # 作成・更新日時はサーバー側のタイムスタンプで記録する
+            "createdAt": firestore.SERVER_TIMESTAMP,
+            "updatedAt": firestore.SERVER_TIMESTAMP,
             "updatedUserEmail": user_email
         }
         
-        # 日付文字列の変換 (ISO format)
-        if startDate:
-            try:
-                task_data["startDate"] = datetime.fromisoformat(startDate.replace("Z", "+00:00"))
-            except: pass
-        if dueDate:
-            try:
-                task_data["dueDate"] = datetime.fromisoformat(dueDate.replace("Z", "+00:00"))
-            except: pass
+        # 日付文字列の変換 (ISO format)（解釈できない値はキーごと設定しない）
+        for date_field, date_value in (("startDate", startDate), ("dueDate", dueDate)):
+            parsed = _parse_iso_datetime(date_value)
+            if parsed is not None:
+                task_data[date_field] = parsed
             
         # 保存実行 (projects/{projectId}/tasks/{taskId})
         doc_ref = db.collection("projects").document(project_id).collection("tasks").document()
-        doc_ref.set(task_data)
+        await doc_ref.set(task_data)
         
         return {
             "firestore_create_task_response": {
@@ -1340,11 +2244,11 @@ def firestore_create_task(
             }
         }
     except Exception as e:
-        logger.error(f"Error creating task: {e}")
+        logger.error("Error creating task: %s", e)
         return {"firestore_create_task_response": {"error": str(e)}}
 
 
-def firestore_create_subtask(
+async def firestore_create_subtask(
     user_email: str,
     project_id: str,
     parent_task_id: str,
@@ -1359,14 +2263,18 @@ def firestore_create_subtask(
     """
     タスク配下に新規サブタスクを作成する
     """
-    logger.info(f"Creating subtask for task {parent_task_id} in project {project_id}: {title}")
+    logger.info(
+        "Creating subtask for task %s in project %s: %s",
+        parent_task_id,
+        project_id,
+        title,
+    )
     
     if not project_id or not parent_task_id or not title:
         return {"firestore_create_subtask_response": {"error": "project_id, parent_task_id and title are required"}}
     
     try:
-        db = _db_client
-        current_time = convert_utc_to_jst(datetime.now(dt_timezone.utc))
+        db = _get_db()
         
         # データの構築
         subtask_data = {
@@ -1378,24 +2286,21 @@ def firestore_create_subtask(
             "priority": priority,
             "inReview": False,
             "type": "task",
-            "createdAt": current_time,
-            "updatedAt": current_time,
+            # 作成・更新日時はサーバー側のタイムスタンプで記録する
+            "createdAt": firestore.SERVER_TIMESTAMP,
+            "updatedAt": firestore.SERVER_TIMESTAMP,
             "updatedUserEmail": user_email
         }
         
-        # 日付文字列の変換
-        if startDate:
-            try:
-                subtask_data["startDate"] = datetime.fromisoformat(startDate.replace("Z", "+00:00"))
-            except: pass
-        if dueDate:
-            try:
-                subtask_data["dueDate"] = datetime.fromisoformat(dueDate.replace("Z", "+00:00"))
-            except: pass
+        # 日付文字列の変換（解釈できない値はキーごと設定しない）
+        for date_field, date_value in (("startDate", startDate), ("dueDate", dueDate)):
+            parsed = _parse_iso_datetime(date_value)
+            if parsed is not None:
+                subtask_data[date_field] = parsed
             
         # 保存実行 (projects/{projectId}/tasks/{parent_taskId}/subTasks/{subTaskId})
         doc_ref = db.collection("projects").document(project_id).collection("tasks").document(parent_task_id).collection("subTasks").document()
-        doc_ref.set(subtask_data)
+        await doc_ref.set(subtask_data)
         
         return {
             "firestore_create_subtask_response": {
@@ -1405,5 +2310,5 @@ def firestore_create_subtask(
             }
         }
     except Exception as e:
-        logger.error(f"Error creating subtask: {e}")
+        logger.error("Error creating subtask: %s", e)
         return {"firestore_create_subtask_response": {"error": str(e)}}
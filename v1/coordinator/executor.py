@@ -1,4 +1,9 @@
+import asyncio
+import json
 import os
+import re
+from collections import OrderedDict
+from operator import attrgetter
 from typing import Optional
 from google.adk.agents import Agent
 from google.adk.runners import Runner
@@ -9,8 +14,38 @@ from a2a.server.events import EventQueue
 from a2a.types import TextPart, TaskState
 from a2a.server.tasks import TaskUpdater
 from a2a.utils import new_agent_text_message
+from google.cloud import firestore
 from google.genai import types
 
+from common.const import logger
+
+# user_id 抽出で毎リクエスト使う正規表現は import 時にコンパイルしておく
+_JSON_CHUNK_RE = re.compile(r'\{.*?\}', re.DOTALL)
+_USER_LABEL_RE = re.compile(r"(?:user_id|email_of_the_conversation_partner|email)[:\s]+[\"']?([^\s,\"'{}-]+@[^\s,\"'{}-]+\.[^\s,\"'{}-]+|[^\s,\"'{}-]+)")
+
+# repr() 由来の Python リテラルを JSON として読めるように 1 パスで置換する
+_QUOTE_TABLE = str.maketrans({"'": '"'})
+_PY_LITERALS_RE = re.compile(r"\b(?:None|True|False)\b")
+_PY_TO_JSON = {"None": "null", "True": "true", "False": "false"}
+
+# a2a の Part はテキストを直下または root 配下に持つ
+_PART_TEXT_GETTERS = (attrgetter("text"), attrgetter("root.text"))
+
+# context_id -> session_id のプロセス内キャッシュの上限件数
+_SESSION_CACHE_MAXSIZE = 10_000
+
+
+def _get_part_text(part) -> Optional[str]:
+    for get_text in _PART_TEXT_GETTERS:
+        try:
+            text = get_text(part)
+        except AttributeError:
+            continue
+        if text:
+            return text
+    return None
+
+
 class ProjectLibrarianExecutor(AgentExecutor):
     def __init__(self, agent: Agent, resource_id: Optional[str] = None, project: str = None, location: str = None):
         self.agent = agent
@@ -20,6 +55,10 @@ class ProjectLibrarianExecutor(AgentExecutor):
         self.runner = None
         self.db = None
         self.mapping_collection = "a2a_session_mappings"
+        # 同一会話の2ターン目以降で Firestore を引かないための LRU キャッシュ
+        self._session_cache: OrderedDict[str, str] = OrderedDict()
+        # 応答を待たせないよう裏で実行しているマッピング書き込み（GC 対策で参照を保持）
+        self._pending_mapping_writes: set[asyncio.Task] = set()
         self._app_id = resource_id or os.environ.get("PROJECT_LIBRARIAN_REASONING_ENGINE_ID") or "default-app"
 
     def _extract_user_id_from_context_id(self, context_id: str) -> str:
@@ -54,53 +93,80 @@ class ProjectLibrarianExecutor(AgentExecutor):
 
         # 2. Scanning Message Parts (JSON & Text)
         if not user_id and hasattr(context.message, "parts"):
-            import json, re
+            findall_json = _JSON_CHUNK_RE.findall
             for i, part in enumerate(context.message.parts):
-                text = getattr(part, "text", "") or (getattr(part.root, "text", "") if hasattr(part, "root") else "")
-                if not text: continue
+                text = _get_part_text(part)
+                # "{" を含まないパートは JSON になり得ないので正規表現にかけない
+                if not text or "{" not in text: continue
 
                 # Try JSON extraction
-                for match in re.findall(r'\{.*?\}', text, re.DOTALL):
+                for match in findall_json(text):
                     try:
                         uid = pick_uid(json.loads(match))
                         if uid:
                             user_id = uid
-                            print(f"[ProjectLibrarian] Found user_id in part[{i}] JSON: {user_id}")
+                            logger.debug("[ProjectLibrarian] Found user_id in part[%d] JSON: %s", i, user_id)
                             break
-                    except: pass
+                    except (ValueError, TypeError): pass
                 if user_id: break
 
         # 3. Global Regex Scan (JSON & Plain Text Labels)
         if not user_id or user_id == "default_user":
-            import re, json
-            raw_data = query + " " + repr(context.message)
-            
-            # A. Search for JSON in raw string
-            for match in re.findall(r'\{.*?\}', raw_data, re.DOTALL):
-                try:
-                    j_str = match.replace("'", '"').replace("None", "null").replace("True", "true").replace("False", "false")
-                    uid = pick_uid(json.loads(j_str))
-                    if uid:
-                        user_id = uid
-                        print(f"[ProjectLibrarian] Found user_id in global JSON scan: {user_id}")
-                        break
-                except: pass
+            # repr(context.message) は重いので、query だけで見つかった場合は生成しない
+            message_repr = None
+
+            # A. Search for JSON in raw string (query -> message の順)
+            found = False
+            for source in (query, None):
+                if source is None:
+                    source = message_repr = repr(context.message)
+                for match in _JSON_CHUNK_RE.findall(source):
+                    try:
+                        j_str = _PY_LITERALS_RE.sub(lambda m: _PY_TO_JSON[m.group()], match.translate(_QUOTE_TABLE))
+                        uid = pick_uid(json.loads(j_str))
+                        if uid:
+                            user_id = uid
+                            found = True
+                            logger.debug("[ProjectLibrarian] Found user_id in global JSON scan: %s", user_id)
+                            break
+                    except (ValueError, TypeError): pass
+                if found: break
             
             # B. Search for plain text labels (Avoiding internal strings like 'role=')
             if not user_id or user_id == "default_user":
+                if message_repr is None:
+                    message_repr = repr(context.message)
+                raw_data = query + " " + message_repr
                 # Sharpen regex: look for user/user_id/email patterns specifically, avoiding common internal strings
-                match = re.search(r"(?:user_id|email_of_the_conversation_partner|email)[:\s]+[\"']?([^\s,\"'{}-]+@[^\s,\"'{}-]+\.[^\s,\"'{}-]+|[^\s,\"'{}-]+)", raw_data)
+                match = _USER_LABEL_RE.search(raw_data)
                 if match:
                     val = match.group(1).strip('"\'')
                     # internal strings often end with '>' or start with 'role='
                     if not val.endswith('>') and 'role=' not in val:
                         user_id = val
-                        print(f"[ProjectLibrarian] Found user_id via text label: {user_id}")
+                        logger.debug("[ProjectLibrarian] Found user_id via text label: %s", user_id)
 
         # 4. Final Fallbacks
         user_id = user_id or self._extract_user_id_from_context_id(context.context_id)
         return user_id or "default_user"
 
+    def _get_cached_session_id(self, context_id: str) -> Optional[str]:
+        session_id = self._session_cache.get(context_id)
+        if session_id is not None:
+            self._session_cache.move_to_end(context_id)
+        return session_id
+
+    def _cache_session_id(self, context_id: str, session_id: str) -> None:
+        self._session_cache[context_id] = session_id
+        self._session_cache.move_to_end(context_id)
+        if len(self._session_cache) > _SESSION_CACHE_MAXSIZE:
+            self._session_cache.popitem(last=False)
+
+    def _on_mapping_written(self, task: asyncio.Task) -> None:
+        self._pending_mapping_writes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("[ProjectLibrarian] Failed to save session mapping: %s", task.exception())
+
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
         # このエージェントではキャンセル処理は未実装としています
         raise NotImplementedError("Task cancellation is not supported")
@@ -122,13 +188,18 @@ class ProjectLibrarianExecutor(AgentExecutor):
 
         # Firestore client の遅延初期化（Pickle対策）
         if self.db is None:
-            from google.cloud import firestore
             db_name = os.environ.get("FIRESTORE_DB_NAME", "(default)")
             if db_name == "default":
                 db_name = "(default)"
             self.db = firestore.AsyncClient(database=db_name)
 
-        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        # 以降で繰り返し参照する属性はローカル変数に束縛しておく
+        runner = self.runner
+        db = self.db
+        app_id = self._app_id
+        context_id = context.context_id
+
+        updater = TaskUpdater(event_queue, context.task_id, context_id)
         if not context.current_task:
             await updater.submit()
         await updater.start_work()
@@ -136,48 +207,58 @@ class ProjectLibrarianExecutor(AgentExecutor):
         query = context.get_user_input()
         content = types.Content(role="user", parts=[types.Part(text=query)])
         
-        print(f"[ProjectLibrarian][DEBUG] context_id: {context.context_id}")
-        print(f"[ProjectLibrarian][DEBUG] query: {query}")
-        print(f"[ProjectLibrarian][DEBUG] message object: {repr(context.message)}")
+        # 本番 (LOG_LEVEL != DEBUG) では repr() 自体が評価されないよう遅延フォーマットにする
+        logger.debug("[ProjectLibrarian] context_id: %s", context_id)
+        logger.debug("[ProjectLibrarian] query: %s", query)
+        logger.debug("[ProjectLibrarian] message object: %r", context.message)
 
         user_id = self._extract_user_id(context, query)
-        print(f"[ProjectLibrarian] Final selected user_id: {user_id}")
+        logger.debug("[ProjectLibrarian] Final selected user_id: %s", user_id)
 
         try:
             # context_id を本物の Vertex AI session_id に紐付ける（Vertex AIはカスタムID指定をサポートしていないため）
-            session_id = None
-            mapping_ref = self.db.collection(self.mapping_collection).document(context.context_id)
-            doc = await mapping_ref.get()
-            
-            if doc.exists:
-                session_id = doc.to_dict().get("session_id")
-                print(f"[ProjectLibrarian] Mapping found: A2A context_id {context.context_id} -> Vertex session_id {session_id}")
+            session_id = self._get_cached_session_id(context_id)
+            if session_id:
+                logger.debug("[ProjectLibrarian] Mapping cache hit: A2A context_id %s -> Vertex session_id %s", context_id, session_id)
+            else:
+                mapping_ref = db.collection(self.mapping_collection).document(context_id)
+                doc = await mapping_ref.get()
+
+                if doc.exists:
+                    session_id = doc.to_dict().get("session_id")
+                    logger.debug("[ProjectLibrarian] Mapping found: A2A context_id %s -> Vertex session_id %s", context_id, session_id)
             
             if not session_id:
-                print(f"[ProjectLibrarian] No mapping found for context_id {context.context_id}, creating new Vertex session")
-                session = await self.runner.session_service.create_session(
-                    app_name=self._app_id,
+                logger.debug("[ProjectLibrarian] No mapping found for context_id %s, creating new Vertex session", context_id)
+                session = await runner.session_service.create_session(
+                    app_name=app_id,
                     user_id=user_id
                 )
                 session_id = session.id
-                await mapping_ref.set({"session_id": session_id, "user_id": user_id})
-                print(f"[ProjectLibrarian] Created mapping: context_id {context.context_id} -> session_id {session_id}")
+                # マッピングの保存は run_async の開始を待たせないよう裏で行う
+                write_task = asyncio.create_task(
+                    mapping_ref.set({"session_id": session_id, "user_id": user_id})
+                )
+                self._pending_mapping_writes.add(write_task)
+                write_task.add_done_callback(self._on_mapping_written)
+                logger.debug("[ProjectLibrarian] Created mapping: context_id %s -> session_id %s", context_id, session_id)
+
+            self._cache_session_id(context_id, session_id)
             
-            print(f"[ProjectLibrarian] Starting run_async with session_id: {session_id}, user_id: {user_id}")
+            logger.debug("[ProjectLibrarian] Starting run_async with session_id: %s, user_id: %s", session_id, user_id)
     
-            async for event in self.runner.run_async(
+            async for event in runner.run_async(
                 session_id=session_id,
                 user_id=user_id,
                 new_message=content
             ):
                 if event.content and event.content.parts:
-                    # AIの返答から「テキスト」をすべてつなげて取得
-                    all_text = "".join([p.text for p in event.content.parts if p.text])
-                    
                     for part in event.content.parts:
                         # get_user_choiceがあったらA2Aの仕組みでユーザーに聞く
                         if part.function_call and part.function_call.name == "get_user_choice":
                             msg = part.function_call.args.get('message', '確認が必要です')
+                            # AIの返答から「テキスト」をすべてつなげて取得（確認時にのみ必要）
+                            all_text = "".join(p.text for p in event.content.parts if p.text)
                             # AIがしゃべったテキストがあれば、それをメッセージの前に追加（Cortexで見えるようにする）
                             full_msg = f"{all_text}\n\n{msg}" if all_text else msg
                             await updater.add_artifact([TextPart(text=full_msg)], name="confirmation")
@@ -191,5 +272,5 @@ class ProjectLibrarianExecutor(AgentExecutor):
         except Exception as e:
             import traceback
             error_detail = traceback.format_exc()
-            print(f"[ProjectLibrarian] Error during execution: {error_detail}")
+            logger.error("[ProjectLibrarian] Error during execution: %s", error_detail)
             await updater.update_status(TaskState.failed, message=new_agent_text_message(f"Error: {str(e)}"))
\ No newline at end of file
@@ -0,0 +1,15 @@
+"""projects の memberEmails を members から作り直す（デプロイ前に一度だけ実行する）"""
+
+import asyncio
+import os
+import sys
+
+# プロジェクトルートディレクトリをパスに追加
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from common.firestore_tools import backfill_member_emails
+
+if __name__ == "__main__":
+    updated = asyncio.run(backfill_member_emails())
+    print(f"✅ memberEmails を {updated} 件のプロジェクトに書き込みました")
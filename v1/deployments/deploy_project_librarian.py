@@ -1,6 +1,7 @@
 import os
 import sys
 import argparse
+from functools import lru_cache
 
 # プロジェクトルートディレクトリをパスに追加
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -47,7 +48,8 @@ vertexai.init(
     staging_bucket=f"gs://{STAGING_BUCKET}-dev-onishi"
 )
 
-# エージェントカードの定義
+# エージェントカードの定義（入力が無く内容は固定なので一度だけ構築する）
+@lru_cache(maxsize=1)
 def create_librarian_agent_card() -> AgentCard:
     skill = AgentSkill(
         description="Firestoreからプロジェクト情報を検索し、ユーザーに提案します。",